@@ -8,6 +8,10 @@ from allauth.account.adapter import DefaultAccountAdapter
 
 logger = logging.getLogger(__name__)
 
+_SEND_ATTEMPT_MSG = "Attempting to send email to %s (template: %s)"
+_SEND_SUCCESS_MSG = "Email sent successfully to %s"
+_SEND_FAILURE_MSG = "Failed to send email to %s: %s"
+
 
 class CustomAccountAdapter(DefaultAccountAdapter):
     """
@@ -20,7 +24,8 @@ class CustomAccountAdapter(DefaultAccountAdapter):
         Superusers and staff don't need email verification.
         """
         user = getattr(request, 'user', None)
-        if user and user.is_authenticated and (user.is_superuser or user.is_staff):
+        # Anonymous users have is_staff/is_superuser False, so no is_authenticated check needed
+        if getattr(user, 'is_staff', False) or getattr(user, 'is_superuser', False):
             return True
         return super().is_email_verified(request, email)
     
@@ -29,10 +34,10 @@ class CustomAccountAdapter(DefaultAccountAdapter):
         Override send_mail to catch and log email errors instead of crashing.
         """
         try:
-            logger.info(f"Attempting to send email to {email} (template: {template_prefix})")
+            logger.info(_SEND_ATTEMPT_MSG, email, template_prefix)
             super().send_mail(template_prefix, email, context)
-            logger.info(f"Email sent successfully to {email}")
+            logger.info(_SEND_SUCCESS_MSG, email)
         except Exception as e:
             # Log the error but don't crash signup
-            logger.error(f"Failed to send email to {email}: {e}", exc_info=True)
+            logger.error(_SEND_FAILURE_MSG, email, e, exc_info=True)
             # Don't re-raise - let signup continue without email
@@ -2,62 +2,43 @@
 Admin configuration for accounts app.
 """
 
-import os
 import logging
 from django import forms
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from django.contrib.auth import authenticate
 from django.contrib import messages
+from django.core import signing
+from django.db import transaction
+from django.db.models import Count
 from django.shortcuts import render, redirect
 from django.urls import path
 from django.http import HttpResponseRedirect
-from allauth.account.models import EmailAddress
+from django.utils.http import urlencode
+from allauth.account.models import EmailAddress, EmailConfirmation
+from booking.models import Appointment
+from portal.models import PortalUpload
+from .cloudinary_cleanup import get_cloudinary_resource
 from .models import CustomUser
+from .tasks import purge_cloudinary_files
 
 logger = logging.getLogger(__name__)
 
+# Signed token carrying the selected user IDs to the deletion confirm view
+DELETE_USERS_TOKEN_SALT = 'accounts.admin.delete-users'
+DELETE_USERS_TOKEN_MAX_AGE = 60 * 10  # 10 minutes
+DELETE_USERS_CHUNK_SIZE = 200
 
-def delete_cloudinary_file(file_field):
-    """Delete a file from Cloudinary storage."""
-    if not file_field:
-        return False
+
+def raw_delete_email_addresses(email_addresses):
+    """
+    Delete EmailAddress rows with a plain SQL DELETE, skipping the ORM collector.
     
-    try:
-        # Get the public_id from the file path
-        file_name = file_field.name
-        if not file_name:
-            return False
-        
-        # Only delete if using Cloudinary (check env variable)
-        if not os.getenv("CLOUDINARY_CLOUD_NAME"):
-            return False
-        
-        import cloudinary.uploader
-        
-        # Extract public_id from the file path
-        # Cloudinary stores files like: media/patient_uploads/1/xray_20260109.pdf
-        # The public_id would be: patient_uploads/1/xray_20260109
-        public_id = file_name
-        
-        # Remove extension for images (Cloudinary doesn't need it)
-        if '.' in public_id:
-            public_id = public_id.rsplit('.', 1)[0]
-        
-        # Determine resource type based on file extension
-        ext = file_name.rsplit('.', 1)[-1].lower() if '.' in file_name else ''
-        if ext in ['pdf', 'doc', 'docx', 'dcm']:
-            resource_type = 'raw'
-        else:
-            resource_type = 'image'
-        
-        result = cloudinary.uploader.destroy(public_id, resource_type=resource_type)
-        logger.info(f"Cloudinary delete result for {public_id}: {result}")
-        return result.get('result') == 'ok'
-        
-    except Exception as e:
-        logger.error(f"Failed to delete from Cloudinary: {e}")
-        return False
+    Nothing listens for EmailAddress delete signals; the only cascade is
+    EmailConfirmation, which is cleared the same way first.
+    """
+    confirmations = EmailConfirmation.objects.filter(email_address__in=email_addresses)
+    confirmations._raw_delete(confirmations.db)
+    return email_addresses._raw_delete(email_addresses.db)
 
 
 class PasswordConfirmForm(forms.Form):
@@ -87,14 +68,14 @@ class EmailAddressAdmin(admin.ModelAdmin):
     list_filter = ['verified', 'primary']
     search_fields = ['email', 'user__username', 'user__email']
     raw_id_fields = ['user']
+    list_select_related = ['user']
+    show_full_result_count = False
     
     actions = ['delete_orphaned_emails']
     
     def delete_orphaned_emails(self, request, queryset):
         """Delete email addresses where user no longer exists."""
-        orphaned = queryset.filter(user__isnull=True)
-        count = orphaned.count()
-        orphaned.delete()
+        count = raw_delete_email_addresses(queryset.filter(user__isnull=True))
         messages.success(request, f"Deleted {count} orphaned email address(es).")
     
     delete_orphaned_emails.short_description = "Delete orphaned email addresses (no user)"
@@ -117,6 +98,7 @@ class CustomUserAdmin(BaseUserAdmin):
     list_display = ['username', 'email', 'first_name', 'last_name', 'is_patient', 'is_doctor', 'is_staff']
     list_filter = BaseUserAdmin.list_filter + ('is_patient', 'is_doctor', 'is_staff_member', 'preferred_language')
     search_fields = ['username', 'email', 'first_name', 'last_name', 'phone_number']
+    show_full_result_count = False
     
     actions = ['delete_users_with_confirmation']
     
@@ -134,96 +116,101 @@ class CustomUserAdmin(BaseUserAdmin):
     
     def delete_users_with_confirmation(self, request, queryset):
         """Redirect to password confirmation page before deleting."""
-        # Store selected user IDs in session
-        request.session['users_to_delete'] = list(queryset.values_list('id', flat=True))
-        request.session['users_to_delete_info'] = [
-            f"{u.email or u.username}" for u in queryset
-        ]
-        return HttpResponseRedirect('delete-users-confirm/')
+        # Pass selected user IDs to the confirm view in a signed token
+        token = signing.dumps(
+            list(queryset.values_list('id', flat=True)), salt=DELETE_USERS_TOKEN_SALT
+        )
+        return HttpResponseRedirect(f'delete-users-confirm/?{urlencode({"t": token})}')
     
     delete_users_with_confirmation.short_description = "🗑️ Delete users completely (requires password)"
     
     def delete_users_confirm_view(self, request):
         """View to confirm deletion with password."""
-        user_ids = request.session.get('users_to_delete', [])
-        user_info = request.session.get('users_to_delete_info', [])
+        token = request.GET.get('t') or request.POST.get('t') or ''
+        try:
+            user_ids = signing.loads(
+                token, salt=DELETE_USERS_TOKEN_SALT, max_age=DELETE_USERS_TOKEN_MAX_AGE
+            )
+        except signing.SignatureExpired:
+            messages.error(request, "Deletion request expired. Please select the users again.")
+            return redirect('..')
+        except signing.BadSignature:
+            user_ids = []
         
         if not user_ids:
             messages.error(request, "No users selected for deletion.")
             return redirect('..')
         
-        users = CustomUser.objects.filter(id__in=user_ids)
+        # Fetch users with their patient profile and related counts in a single query
+        users = CustomUser.objects.filter(id__in=user_ids).select_related(
+            'patient_profile'
+        ).annotate(
+            appointments_count=Count('patient_profile__appointments', distinct=True),
+            uploads_count=Count('patient_profile__uploads', distinct=True),
+        )
         
         if request.method == 'POST':
             form = PasswordConfirmForm(request.POST)
             if form.is_valid():
                 password = form.cleaned_data['password']
                 
-                # Verify admin password
-                admin_user = authenticate(
-                    request,
-                    username=request.user.username,
-                    password=password
-                )
-                
-                if admin_user is not None and admin_user == request.user:
+                # Verify admin password against the already-authenticated user
+                if request.user.check_password(password):
                     # Password verified - proceed with deletion
-                    count = 0
                     deleted_info = []
-                    files_deleted = 0
+                    file_names = []
                     
-                    for user in users:
-                        try:
-                            email = user.email or user.username
-                            
-                            # Get related data counts for logging
-                            patient = getattr(user, 'patient_profile', None)
-                            appointments_count = 0
-                            uploads_count = 0
-                            
-                            if patient:
-                                appointments_count = patient.appointments.count()
-                                uploads_count = patient.uploads.count()
-                                
-                                # Delete profile picture from Cloudinary
-                                if patient.profile_picture:
-                                    if delete_cloudinary_file(patient.profile_picture):
-                                        files_deleted += 1
-                                
-                                # Delete all uploaded documents from Cloudinary
-                                for upload in patient.uploads.all():
-                                    if upload.file:
-                                        if delete_cloudinary_file(upload.file):
-                                            files_deleted += 1
-                                
-                                # Delete payment proofs from appointments
-                                for appointment in patient.appointments.all():
-                                    if appointment.payment_proof:
-                                        if delete_cloudinary_file(appointment.payment_proof):
-                                            files_deleted += 1
-                            
-                            # Delete allauth email addresses
-                            EmailAddress.objects.filter(user=user).delete()
-                            
-                            # Delete user (cascades to Patient, Appointments, Uploads, etc.)
-                            user.delete()
-                            
-                            deleted_info.append(
-                                f"{email} (appointments: {appointments_count}, uploads: {uploads_count})"
+                    # Stream users in chunks to collect display info and profile pictures
+                    for user in users.iterator(chunk_size=DELETE_USERS_CHUNK_SIZE):
+                        email = user.email or user.username
+                        patient = getattr(user, 'patient_profile', None)
+                        
+                        if patient:
+                            file_names.append(patient.profile_picture.name)
+                        
+                        deleted_info.append(
+                            f"{email} (appointments: {user.appointments_count}, uploads: {user.uploads_count})"
+                        )
+                    
+                    # Uploaded documents and payment proofs: file names only, one query each
+                    file_names.extend(
+                        PortalUpload.objects.filter(
+                            patient__user_id__in=user_ids
+                        ).values_list('file', flat=True)
+                    )
+                    file_names.extend(
+                        Appointment.objects.filter(
+                            patient__user_id__in=user_ids
+                        ).values_list('payment_proof', flat=True)
+                    )
+                    cloudinary_resources = [
+                        resource for resource in map(get_cloudinary_resource, file_names)
+                        if resource
+                    ]
+                    
+                    try:
+                        with transaction.atomic():
+                            # Delete allauth email addresses for all selected users in one query
+                            raw_delete_email_addresses(
+                                EmailAddress.objects.filter(user_id__in=user_ids)
                             )
-                            count += 1
                             
-                        except Exception as e:
-                            logger.error(f"Error deleting user {user.email}: {e}", exc_info=True)
-                            messages.error(request, f"Error deleting {user.email}: {str(e)}")
+                            # Delete users (cascades to Patient, Appointments, Uploads, etc.)
+                            _, deleted_per_model = CustomUser.objects.filter(id__in=user_ids).delete()
+                    except Exception as e:
+                        logger.error(f"Error deleting users {user_ids}: {e}", exc_info=True)
+                        messages.error(request, f"Error deleting users: {str(e)}")
+                        return redirect('..')
                     
-                    # Clear session
-                    del request.session['users_to_delete']
-                    del request.session['users_to_delete_info']
+                    count = deleted_per_model.get(CustomUser._meta.label, 0)
+                    
+                    # Remove the users' files from Cloudinary in the background
+                    if cloudinary_resources:
+                        purge_cloudinary_files.delay(cloudinary_resources)
                     
                     messages.success(
                         request,
-                        f"✅ Successfully deleted {count} user(s), {files_deleted} file(s) from cloud storage, and ALL their data: {', '.join(deleted_info)}"
+                        f"✅ Successfully deleted {count} user(s) and ALL their data ({len(cloudinary_resources)} file(s) queued for removal from cloud storage): {', '.join(deleted_info)}"
                     )
                     return redirect('..')
                 else:
@@ -231,6 +218,9 @@ class CustomUserAdmin(BaseUserAdmin):
         else:
             form = PasswordConfirmForm()
         
+        # Evaluate once; the preview loop and user_count reuse these rows
+        users = list(users)
+        
         # Gather info about what will be deleted
         deletion_preview = []
         for user in users:
@@ -238,8 +228,8 @@ class CustomUserAdmin(BaseUserAdmin):
             info = {
                 'email': user.email or user.username,
                 'name': user.get_full_name() or 'N/A',
-                'appointments': patient.appointments.count() if patient else 0,
-                'uploads': patient.uploads.count() if patient else 0,
+                'appointments': user.appointments_count,
+                'uploads': user.uploads_count,
                 'has_patient': patient is not None,
             }
             deletion_preview.append(info)
@@ -250,6 +240,7 @@ class CustomUserAdmin(BaseUserAdmin):
             'form': form,
             'users': deletion_preview,
             'user_count': len(users),
+            'token': token,
             'opts': self.model._meta,
         }
         
@@ -0,0 +1,94 @@
+"""
+Cloudinary cleanup helpers for accounts app.
+
+Used when deleting users to remove their profile pictures, uploaded
+documents and payment proofs from cloud storage.
+"""
+
+import os
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# Only delete from Cloudinary when it is the configured media storage
+CLOUDINARY_ENABLED = bool(os.getenv("CLOUDINARY_CLOUD_NAME"))
+
+# Cloudinary's delete_resources API accepts at most 100 public_ids per call
+CLOUDINARY_DELETE_BATCH_SIZE = 100
+CLOUDINARY_MAX_WORKERS = 8
+
+_cloudinary_api = None
+
+
+def _get_cloudinary_api():
+    """Import the Cloudinary admin API on first use, keeping it off admin startup."""
+    global _cloudinary_api
+    if _cloudinary_api is None:
+        import cloudinary.api
+        _cloudinary_api = cloudinary.api
+    return _cloudinary_api
+
+
+def get_cloudinary_resource(file_name):
+    """Return the (public_id, resource_type) pair for a stored file name."""
+    if not file_name:
+        return None
+    
+    # Extract public_id from the file path
+    # Cloudinary stores files like: media/patient_uploads/1/xray_20260109.pdf
+    # The public_id would be: patient_uploads/1/xray_20260109
+    public_id = file_name
+    
+    # Remove extension for images (Cloudinary doesn't need it)
+    if '.' in public_id:
+        public_id = public_id.rsplit('.', 1)[0]
+    
+    # Determine resource type based on file extension
+    ext = file_name.rsplit('.', 1)[-1].lower() if '.' in file_name else ''
+    if ext in ['pdf', 'doc', 'docx', 'dcm']:
+        resource_type = 'raw'
+    else:
+        resource_type = 'image'
+    
+    return public_id, resource_type
+
+
+def _delete_cloudinary_batch(public_ids, resource_type):
+    """Delete one batch of same-type files; returns the number Cloudinary deleted."""
+    try:
+        result = _get_cloudinary_api().delete_resources(public_ids, resource_type=resource_type)
+    except Exception as e:
+        logger.error(f"Failed to delete from Cloudinary: {e}")
+        return 0
+    
+    logger.info(f"Cloudinary delete result for {len(public_ids)} {resource_type} file(s): {result}")
+    return sum(1 for status in result.get('deleted', {}).values() if status == 'deleted')
+
+
+def delete_cloudinary_files(resources):
+    """
+    Delete files from Cloudinary storage in batches.
+    
+    Takes a list of (public_id, resource_type) pairs and returns the number
+    of files Cloudinary reported as deleted.
+    """
+    if not resources or not CLOUDINARY_ENABLED:
+        return 0
+    
+    # delete_resources works on a single resource type per call
+    public_ids_by_type = {}
+    for public_id, resource_type in resources:
+        public_ids_by_type.setdefault(resource_type, []).append(public_id)
+    
+    batches = [
+        (public_ids[i:i + CLOUDINARY_DELETE_BATCH_SIZE], resource_type)
+        for resource_type, public_ids in public_ids_by_type.items()
+        for i in range(0, len(public_ids), CLOUDINARY_DELETE_BATCH_SIZE)
+    ]
+    
+    # Each batch is an independent HTTPS request, so run them concurrently
+    with ThreadPoolExecutor(max_workers=min(CLOUDINARY_MAX_WORKERS, len(batches))) as executor:
+        results = list(executor.map(_delete_cloudinary_batch, *zip(*batches)))
+    
+    return sum(results)
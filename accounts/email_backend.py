@@ -7,12 +7,64 @@ HTTP requests instead of SMTP connections.
 
 import logging
 import os
-import json
-from urllib import request, error
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from django.core.mail.backends.base import BaseEmailBackend
 
+try:
+    # orjson encodes straight to bytes and is much faster for large HTML bodies
+    import orjson
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:
+    import json
+    
+    def _json_dumps(obj):
+        return json.dumps(obj).encode('utf-8')
+    
+    _json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 
+# Retry transient failures (rate limits, 5xx, connection errors) with exponential
+# backoff and jitter, honouring Retry-After. Client errors (400/401/403/422) are
+# not retried. Each message carries an Idempotency-Key so a retried POST can't
+# deliver the same email twice.
+_RETRY = Retry(
+    total=3,
+    backoff_factor=1.0,
+    backoff_max=30,
+    backoff_jitter=0.5,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=frozenset({"POST"}),
+    respect_retry_after_header=True,
+    raise_on_status=False,
+)
+
+# Read once at import; the environment doesn't change while the process runs
+RESEND_API_KEY = os.getenv("RESEND_API_KEY", "")
+
+
+def _build_session():
+    """Create a pooled Resend API session with auth headers preinstalled."""
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=50, max_retries=_RETRY))
+    session.headers.update({
+        "Authorization": f"Bearer {RESEND_API_KEY}",
+        "Content-Type": "application/json",
+    })
+    return session
+
+
+# Process-wide session so keep-alive reuses one TLS connection across sends
+_SESSION = _build_session()
+
+# Parallel HTTP requests per send_messages batch
+SEND_CONCURRENCY = int(os.getenv("EMAIL_SEND_CONCURRENCY", "8"))
+
 
 class ResendEmailBackend(BaseEmailBackend):
     """
@@ -29,8 +81,26 @@ class ResendEmailBackend(BaseEmailBackend):
     
     def __init__(self, fail_silently=False, **kwargs):
         super().__init__(fail_silently=fail_silently, **kwargs)
-        self.api_key = os.getenv("RESEND_API_KEY", "")
-        
+        self.api_key = RESEND_API_KEY
+        self.connection = None
+    
+    def open(self):
+        """
+        Open a dedicated HTTP session for this backend instance, e.g. when used
+        as `with get_connection() as connection:`. Returns True if a new session
+        was created. Without open(), sends use the shared process-wide session.
+        """
+        if self.connection:
+            return False
+        self.connection = _build_session()
+        return True
+    
+    def close(self):
+        """Close the dedicated HTTP session, if one was opened."""
+        if self.connection:
+            self.connection.close()
+            self.connection = None
+    
     def send_messages(self, email_messages):
         """
         Send one or more EmailMessage objects and return the number of email
@@ -42,78 +112,79 @@ class ResendEmailBackend(BaseEmailBackend):
                 raise ValueError("RESEND_API_KEY environment variable is required")
             return 0
         
+        email_messages = list(email_messages)
+        
+        # Single sends don't need a thread pool
+        if len(email_messages) < 2:
+            return sum(self._send_one(message) for message in email_messages)
+        
         num_sent = 0
-        for message in email_messages:
-            try:
-                sent = self._send(message)
-                if sent:
-                    num_sent += 1
-            except Exception as e:
-                logger.error(f"Failed to send email to {message.to}: {e}")
-                if not self.fail_silently:
-                    raise
+        max_workers = min(SEND_CONCURRENCY, len(email_messages))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(self._send_one, message) for message in email_messages]
+            for future in as_completed(futures):
+                num_sent += future.result()
         
         return num_sent
     
+    def _send_one(self, message):
+        """
+        Send a single message, returning 1 if sent and 0 otherwise.
+        Errors are logged and only re-raised when not failing silently.
+        """
+        try:
+            return 1 if self._send(message) else 0
+        except Exception as e:
+            logger.error(f"Failed to send email to {message.to}: {e}")
+            if not self.fail_silently:
+                raise
+            return 0
+    
     def _send(self, message):
         """
         Send a single EmailMessage via Resend API.
         """
         try:
-            # Build the email payload
+            # HTML body from an EmailMultiAlternatives, if any
+            alternatives = getattr(message, 'alternatives', None)
+            html = None
+            if alternatives:
+                html = next(
+                    (content for content, mimetype in alternatives if mimetype == 'text/html'),
+                    None,
+                )
+            
+            # Build the full payload in one literal; unset optional fields are dropped below
             payload = {
                 "from": message.from_email,
                 "to": message.to,
                 "subject": message.subject,
+                "html": html,
+                # Plain-text-only emails always send the body; HTML emails only if it's set
+                "text": message.body if (message.body or not alternatives) else None,
+                "cc": message.cc or None,
+                "bcc": message.bcc or None,
+                "reply_to": message.reply_to[0] if message.reply_to else None,
             }
-            
-            # Handle HTML vs plain text
-            if hasattr(message, 'alternatives') and message.alternatives:
-                # This is an EmailMultiAlternatives with HTML content
-                for content, mimetype in message.alternatives:
-                    if mimetype == 'text/html':
-                        payload["html"] = content
-                        break
-                # Also include plain text version
-                if message.body:
-                    payload["text"] = message.body
-            else:
-                # Plain text only
-                payload["text"] = message.body
-            
-            # Add CC if present
-            if message.cc:
-                payload["cc"] = message.cc
-            
-            # Add BCC if present
-            if message.bcc:
-                payload["bcc"] = message.bcc
-            
-            # Add reply-to if present
-            if message.reply_to:
-                payload["reply_to"] = message.reply_to[0]
+            payload = {key: value for key, value in payload.items() if value is not None}
             
             # Make HTTP request to Resend API
-            data = json.dumps(payload).encode('utf-8')
-            req = request.Request(
+            response = (self.connection or _SESSION).post(
                 self.API_URL,
-                data=data,
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json",
-                },
-                method="POST"
+                data=_json_dumps(payload),
+                headers={"Idempotency-Key": str(uuid.uuid4())},
+                timeout=(5, 30),
             )
-            
-            with request.urlopen(req, timeout=30) as response:
-                result = json.loads(response.read().decode('utf-8'))
-                logger.info(f"Email sent successfully to {message.to} via Resend (id: {result.get('id', 'unknown')})")
-                return True
-            
-        except error.HTTPError as e:
-            error_body = e.read().decode('utf-8')
-            logger.error(f"Resend API HTTP error {e.code}: {error_body}")
-            raise Exception(f"Resend API error: {error_body}")
         except Exception as e:
             logger.error(f"Resend API error: {e}")
             raise
+        
+        if response.status_code >= 400:
+            logger.error(f"Resend API HTTP error {response.status_code}: {response.text}")
+            raise Exception(f"Resend API error: {response.text}")
+        
+        # The response body only carries the message id, so only decode it for logging
+        if logger.isEnabledFor(logging.INFO):
+            result = _json_loads(response.content)
+            logger.info(f"Email sent successfully to {message.to} via Resend (id: {result.get('id', 'unknown')})")
+        return True
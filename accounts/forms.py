@@ -21,11 +21,12 @@ class CustomSignupForm(SignupForm):
         })
     )
     
+    # Show full_name as the first field
+    FIELD_ORDER = ('full_name', 'email', 'password1', 'password2')
+    
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        # Move full_name to be the first field
-        field_order = ['full_name', 'email', 'password1', 'password2']
-        self.order_fields(field_order)
+        self.order_fields(self.FIELD_ORDER)
     
     def save(self, request):
         try:
@@ -37,13 +38,13 @@ class CustomSignupForm(SignupForm):
                 name_parts = full_name.split()
                 user.first_name = name_parts[0] if name_parts else ''
                 user.last_name = ' '.join(name_parts[1:]) if len(name_parts) > 1 else ''
-                user.save()
+                user.save(update_fields=['first_name', 'last_name'])
                 
                 # Also save to patient profile if it exists
                 try:
                     if hasattr(user, 'patient_profile'):
                         user.patient_profile.full_name = full_name
-                        user.patient_profile.save()
+                        user.patient_profile.save(update_fields=['full_name', 'updated_at'])
                 except Exception as e:
                     logger.warning(f"Could not update patient profile for {user.email}: {e}")
             
@@ -3,7 +3,9 @@ Management command to create superuser from environment variables.
 """
 import os
 from django.core.management.base import BaseCommand
+from django.apps import apps
 from django.contrib.auth import get_user_model
+from django.db.models import Q
 
 
 class Command(BaseCommand):
@@ -22,7 +24,12 @@ class Command(BaseCommand):
             ))
             return
         
-        user = User.objects.filter(email=email).first()
+        # One query for both the email and the username check; at most two rows can match
+        existing = list(
+            User.objects.filter(Q(email=email) | Q(username=username))
+            .only('pk', 'email', 'username')[:2]
+        )
+        user = next((u for u in existing if u.email == email), None)
         
         if user:
             self.stdout.write(f'Superuser {email} already exists.')
@@ -30,7 +37,7 @@ class Command(BaseCommand):
             self._verify_email(user, email)
             return
         
-        if User.objects.filter(username=username).exists():
+        if existing:
             self.stdout.write(f'User with username {username} already exists.')
             return
         
@@ -46,6 +53,10 @@ class Command(BaseCommand):
     
     def _verify_email(self, user, email):
         """Mark the superuser's email as verified in allauth EmailAddress table."""
+        if not apps.is_installed('allauth.account'):
+            self.stdout.write('allauth not installed - skipping email verification.')
+            return
+        
         try:
             from allauth.account.models import EmailAddress
             
@@ -58,7 +69,7 @@ class Command(BaseCommand):
             if not email_address.verified:
                 email_address.verified = True
                 email_address.primary = True
-                email_address.save()
+                email_address.save(update_fields=['verified', 'primary'])
                 self.stdout.write(self.style.SUCCESS(f'Email {email} marked as verified.'))
             elif created:
                 self.stdout.write(self.style.SUCCESS(f'Email {email} created and verified.'))
@@ -66,4 +77,5 @@ class Command(BaseCommand):
                 self.stdout.write(f'Email {email} already verified.')
                 
         except Exception as e:
+            # Runs during the build; never let this abort a deploy
             self.stdout.write(self.style.WARNING(f'Could not verify email: {e}'))
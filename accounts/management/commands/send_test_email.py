@@ -2,6 +2,8 @@ from django.core.mail import send_mail
 from django.conf import settings
 from django.core.management.base import BaseCommand, CommandError
 
+from accounts.tasks import send_email_task
+
 
 class Command(BaseCommand):
     help = "Send a test email to verify SMTP delivery"
@@ -21,6 +23,11 @@ class Command(BaseCommand):
             ),
             help="Email body",
         )
+        parser.add_argument(
+            "--queue",
+            action="store_true",
+            help="Send through the Celery email queue instead of inline",
+        )
 
     def handle(self, *args, **options):
         to = options.get("to")
@@ -30,6 +37,11 @@ class Command(BaseCommand):
         if not to:
             raise CommandError("Please provide a recipient: manage.py send_test_email <email>")
 
+        if options.get("queue"):
+            send_email_task.delay(subject, body, settings.DEFAULT_FROM_EMAIL, [to])
+            self.stdout.write(self.style.SUCCESS(f"Test email to {to} queued for delivery."))
+            return
+
         self.stdout.write(self.style.WARNING(f"Sending test email to {to} ..."))
         sent = send_mail(
             subject,
@@ -14,9 +14,13 @@ class Command(BaseCommand):
         domain = options["domain"] or os.getenv("SITE_DOMAIN", "127.0.0.1:8000")
         name = options["name"]
 
-        site = Site.objects.get(pk=1)
+        site = Site.objects.only("pk", "domain", "name").get(pk=1)
+        if site.domain == domain and site.name == name:
+            self.stdout.write(f"Site unchanged: domain='{domain}', name='{name}'")
+            return
+
         site.domain = domain
         site.name = name
-        site.save()
+        site.save(update_fields=["domain", "name"])
 
         self.stdout.write(self.style.SUCCESS(f"Site updated: domain='{domain}', name='{name}'"))
@@ -0,0 +1,26 @@
+"""
+Background tasks for accounts app.
+"""
+
+from celery import shared_task
+from django.core.mail import EmailMultiAlternatives
+
+from .cloudinary_cleanup import delete_cloudinary_files
+
+
+@shared_task
+def purge_cloudinary_files(resources):
+    """Delete a deleted user's files from Cloudinary outside the admin request."""
+    return delete_cloudinary_files(resources)
+
+
+# No Celery retries: ResendEmailBackend already retries transient failures
+# under one Idempotency-Key, and a second layer could deliver twice
+@shared_task
+def send_email_task(subject, body, from_email, to, html=None):
+    """Send an email from a worker so the request doesn't wait on the email API."""
+    message = EmailMultiAlternatives(subject, body, from_email, to)
+    if html:
+        message.attach_alternative(html, 'text/html')
+    return message.send()
+
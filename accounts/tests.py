@@ -1,3 +1,70 @@
-from django.test import TestCase
+import time
+from unittest import mock
+from urllib.parse import parse_qs, urlsplit
 
-# Create your tests here.
+from django.contrib.messages import get_messages
+from django.core import signing
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from .admin import DELETE_USERS_TOKEN_MAX_AGE, DELETE_USERS_TOKEN_SALT
+from .models import CustomUser
+
+# Cached sessions need a cache; don't need Redis in tests
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class DeleteUsersConfirmTokenTests(TestCase):
+    def setUp(self):
+        self.admin = CustomUser.objects.create_superuser('admin', 'admin@example.com', 'secret')
+        self.target = CustomUser.objects.create_user('target', 'target@example.com', 'secret')
+        self.client.force_login(self.admin)
+        self.url = reverse('admin:accounts_customuser_delete_confirm')
+
+    def confirm(self, token, password='secret'):
+        return self.client.post(self.url, {'t': token, 'password': password})
+
+    def messages(self, response):
+        return [str(message) for message in get_messages(response.wsgi_request)]
+
+    def test_action_redirects_with_signed_user_ids(self):
+        response = self.client.post(reverse('admin:accounts_customuser_changelist'), {
+            'action': 'delete_users_with_confirmation',
+            '_selected_action': [str(self.target.pk)],
+        })
+
+        self.assertEqual(response.status_code, 302)
+        token = parse_qs(urlsplit(response['Location']).query)['t'][0]
+        self.assertEqual(
+            signing.loads(token, salt=DELETE_USERS_TOKEN_SALT, max_age=DELETE_USERS_TOKEN_MAX_AGE),
+            [self.target.pk],
+        )
+
+    def test_valid_token_and_password_deletes_users(self):
+        token = signing.dumps([self.target.pk], salt=DELETE_USERS_TOKEN_SALT)
+
+        response = self.confirm(token)
+
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(CustomUser.objects.filter(pk=self.target.pk).exists())
+
+    def test_expired_token_is_rejected(self):
+        issued_at = time.time() - DELETE_USERS_TOKEN_MAX_AGE - 1
+        with mock.patch('django.core.signing.time.time', return_value=issued_at):
+            token = signing.dumps([self.target.pk], salt=DELETE_USERS_TOKEN_SALT)
+
+        response = self.confirm(token)
+
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(CustomUser.objects.filter(pk=self.target.pk).exists())
+        self.assertIn('Deletion request expired. Please select the users again.', self.messages(response))
+
+    def test_tampered_token_is_rejected(self):
+        token = signing.dumps([self.target.pk], salt=DELETE_USERS_TOKEN_SALT)
+
+        response = self.confirm(token[:-1] + ('A' if token[-1] != 'A' else 'B'))
+
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(CustomUser.objects.filter(pk=self.target.pk).exists())
+        self.assertIn('No users selected for deletion.', self.messages(response))
@@ -3,7 +3,78 @@ Admin configuration for booking app.
 """
 
 from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connections, transaction
+from django.utils import timezone
+from django.utils.functional import cached_property
 from .models import TimeSlot, Appointment, Patient, VideoConsultation, Payment
+from .tasks import send_appointment_confirmations
+from .video_conference import VideoConferenceService
+
+
+# Below this many rows an exact COUNT(*) is cheap enough to keep
+ESTIMATE_COUNT_THRESHOLD = 10000
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that reads the planner's row estimate for unfiltered changelists
+    on PostgreSQL instead of running COUNT(*) over the whole table.
+    """
+
+    @cached_property
+    def count(self):
+        query = self.object_list.query
+        connection = connections[self.object_list.db]
+        if connection.vendor == 'postgresql' and not query.where:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'SELECT reltuples FROM pg_class WHERE relname = %s',
+                    [query.model._meta.db_table],
+                )
+                row = cursor.fetchone()
+            if row and row[0] > ESTIMATE_COUNT_THRESHOLD:
+                return int(row[0])
+        return super().count
+
+
+class ModelAdminEstimateCountMixin:
+    """Use the estimated row count for the changelist pagination footer."""
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+def assign_meeting_rooms(consultations, fields):
+    """
+    Generate meeting rooms in memory and write the batch back with one
+    bulk_update. Callers wrap this in transaction.atomic().
+    """
+    now = timezone.now()
+    for consultation in consultations:
+        consultation.room_id, consultation.meeting_url = (
+            VideoConferenceService.create_consultation_room(consultation)
+        )
+        consultation.updated_at = now
+    VideoConsultation.objects.bulk_update(
+        consultations, [*fields, 'room_id', 'meeting_url', 'updated_at'], batch_size=500
+    )
+
+
+class CurrencyListFilter(admin.SimpleListFilter):
+    """
+    Currency filter built from Payment.CURRENCY_CHOICES, so the changelist
+    doesn't run SELECT DISTINCT over the payments table to find the options.
+    """
+    title = 'currency'
+    parameter_name = 'currency'
+
+    def lookups(self, request, model_admin):
+        return Payment.CURRENCY_CHOICES
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(currency=self.value())
+        return queryset
 
 
 @admin.register(Patient)
@@ -12,6 +83,7 @@ class PatientAdmin(admin.ModelAdmin):
     list_filter = ['country', 'interested_in_procedure', 'preferred_language', 'created_at']
     search_fields = ['user__email', 'user__first_name', 'user__last_name', 'phone_number', 'country']
     readonly_fields = ['created_at', 'updated_at']
+    list_select_related = ['user']
     
     fieldsets = (
         ('User Information', {
@@ -37,12 +109,21 @@ class PatientAdmin(admin.ModelAdmin):
 
 
 @admin.register(TimeSlot)
-class TimeSlotAdmin(admin.ModelAdmin):
+class TimeSlotAdmin(ModelAdminEstimateCountMixin, admin.ModelAdmin):
     list_display = ['date', 'start_time', 'end_time', 'timezone', 'slot_type', 'is_available', 'current_bookings', 'max_bookings']
     list_filter = ['is_available', 'slot_type', 'date']
     search_fields = ['date']
     date_hierarchy = 'date'
     
+    def get_queryset(self, request):
+        # Count active bookings in the changelist query instead of one
+        # COUNT per row through TimeSlot.current_bookings
+        return super().get_queryset(request).with_booking_counts()
+    
+    @admin.display(description='Current bookings', ordering='_current_bookings')
+    def current_bookings(self, obj):
+        return obj.current_bookings
+    
     fieldsets = (
         ('Time Information', {
             'fields': ('date', 'start_time', 'end_time', 'timezone')
@@ -54,12 +135,15 @@ class TimeSlotAdmin(admin.ModelAdmin):
 
 
 @admin.register(Appointment)
-class AppointmentAdmin(admin.ModelAdmin):
+class AppointmentAdmin(ModelAdminEstimateCountMixin, admin.ModelAdmin):
     list_display = ['patient', 'time_slot', 'appointment_type', 'status', 'consultation_method', 'created_at']
     list_filter = ['status', 'appointment_type', 'consultation_method', 'created_at']
     search_fields = ['patient__user__email', 'patient__user__first_name', 'patient__user__last_name']
     readonly_fields = ['created_at', 'updated_at', 'reminder_sent_24h', 'reminder_sent_1h']
     date_hierarchy = 'created_at'
+    list_per_page = 50
+    # patient and time_slot columns render via __str__, which reads patient.user
+    list_select_related = ['patient__user', 'time_slot']
     
     fieldsets = (
         ('Appointment Details', {
@@ -88,9 +172,9 @@ class AppointmentAdmin(admin.ModelAdmin):
     actions = ['send_confirmation', 'mark_confirmed', 'mark_completed']
     
     def send_confirmation(self, request, queryset):
-        for appointment in queryset:
-            appointment.send_confirmation_email()
-        self.message_user(request, f"{queryset.count()} confirmations sent.")
+        appointment_ids = list(queryset.values_list('id', flat=True))
+        send_appointment_confirmations.delay(appointment_ids)
+        self.message_user(request, f"{len(appointment_ids)} confirmations queued.")
     send_confirmation.short_description = "Send confirmation emails"
     
     def mark_confirmed(self, request, queryset):
@@ -105,12 +189,13 @@ class AppointmentAdmin(admin.ModelAdmin):
 
 
 @admin.register(VideoConsultation)
-class VideoConsultationAdmin(admin.ModelAdmin):
+class VideoConsultationAdmin(ModelAdminEstimateCountMixin, admin.ModelAdmin):
     list_display = ['patient_name', 'patient_email', 'scheduled_date', 'scheduled_time', 'status', 'procedure_interest', 'created_at']
     list_filter = ['status', 'procedure_interest', 'scheduled_date', 'created_at']
     search_fields = ['patient_name', 'patient_email', 'patient_phone']
     readonly_fields = ['id', 'room_id', 'meeting_url', 'created_at', 'updated_at', 'started_at', 'ended_at']
     date_hierarchy = 'scheduled_date'
+    list_per_page = 50
     
     fieldsets = (
         ('Patient Information', {
@@ -143,32 +228,35 @@ class VideoConsultationAdmin(admin.ModelAdmin):
     actions = ['mark_scheduled', 'mark_completed', 'generate_meeting_rooms']
     
     def mark_scheduled(self, request, queryset):
-        for consultation in queryset.filter(status='pending_payment'):
+        consultations = list(queryset.filter(status='pending_payment'))
+        for consultation in consultations:
             consultation.status = 'scheduled'
-            consultation.generate_meeting_room()
-            consultation.save()
-        self.message_user(request, f"Consultations marked as scheduled.")
+        with transaction.atomic():
+            assign_meeting_rooms(consultations, ['status'])
+        self.message_user(request, f"{len(consultations)} consultations marked as scheduled.")
     mark_scheduled.short_description = "Mark as scheduled (skip payment)"
     
     def mark_completed(self, request, queryset):
-        queryset.update(status='completed')
-        self.message_user(request, f"{queryset.count()} consultations marked as completed.")
+        updated = queryset.update(status='completed')
+        self.message_user(request, f"{updated} consultations marked as completed.")
     mark_completed.short_description = "Mark as completed"
     
     def generate_meeting_rooms(self, request, queryset):
-        for consultation in queryset.filter(room_id=''):
-            consultation.generate_meeting_room()
-        self.message_user(request, f"Meeting rooms generated.")
+        consultations = list(queryset.filter(room_id=''))
+        with transaction.atomic():
+            assign_meeting_rooms(consultations, [])
+        self.message_user(request, f"{len(consultations)} meeting rooms generated.")
     generate_meeting_rooms.short_description = "Generate meeting rooms"
 
 
 @admin.register(Payment)
-class PaymentAdmin(admin.ModelAdmin):
+class PaymentAdmin(ModelAdminEstimateCountMixin, admin.ModelAdmin):
     list_display = ['email', 'payment_type', 'amount', 'currency', 'status', 'created_at', 'paid_at']
-    list_filter = ['status', 'payment_type', 'currency', 'created_at']
+    list_filter = ['status', 'payment_type', CurrencyListFilter, 'created_at']
     search_fields = ['email', 'stripe_session_id', 'stripe_payment_intent_id']
     readonly_fields = ['id', 'stripe_session_id', 'stripe_payment_intent_id', 'stripe_customer_id', 'created_at', 'updated_at', 'paid_at']
     date_hierarchy = 'created_at'
+    list_per_page = 50
     
     fieldsets = (
         ('Payment Details', {
@@ -195,12 +283,29 @@ class PaymentAdmin(admin.ModelAdmin):
     actions = ['mark_completed', 'mark_refunded']
     
     def mark_completed(self, request, queryset):
-        for payment in queryset.filter(status='pending'):
-            payment.mark_completed()
-        self.message_user(request, f"Payments marked as completed.")
+        # Same effect as Payment.mark_completed(), batched: one UPDATE for the
+        # payments, one bulk_update for the consultations they unlock
+        payments = list(
+            queryset.filter(status='pending').select_related('video_consultation')
+        )
+        consultations = {
+            payment.video_consultation.pk: payment.video_consultation
+            for payment in payments
+            if payment.video_consultation and payment.video_consultation.status == 'pending_payment'
+        }
+        for consultation in consultations.values():
+            consultation.status = 'scheduled'
+        
+        now = timezone.now()
+        with transaction.atomic():
+            updated = Payment.objects.filter(
+                pk__in=[payment.pk for payment in payments]
+            ).update(status='completed', paid_at=now, updated_at=now)
+            assign_meeting_rooms(list(consultations.values()), ['status'])
+        self.message_user(request, f"{updated} payments marked as completed.")
     mark_completed.short_description = "Mark as completed"
     
     def mark_refunded(self, request, queryset):
-        queryset.update(status='refunded')
-        self.message_user(request, f"{queryset.count()} payments marked as refunded.")
+        updated = queryset.update(status='refunded')
+        self.message_user(request, f"{updated} payments marked as refunded.")
     mark_refunded.short_description = "Mark as refunded"
\ No newline at end of file
@@ -1,7 +1,104 @@
 from django import forms
 from django.utils import timezone
 from .models import Patient, Appointment, TimeSlot
-import pytz
+
+
+# Shared widget attributes (Tailwind classes) for the booking forms
+_INPUT_TEAL = {'class': 'w-full px-4 py-3 border border-gray-300 rounded-lg focus:ring-2 focus:ring-teal-500 focus:border-teal-500'}
+_INPUT_INDIGO = {'class': 'w-full px-4 py-3 border border-gray-300 rounded-lg focus:ring-2 focus:ring-indigo-500 focus:border-indigo-500'}
+_RADIO_TEAL = {'class': 'mr-2 text-teal-600 focus:ring-teal-500'}
+_CHECKBOX_TEAL = {'class': 'h-4 w-4 text-teal-600 focus:ring-teal-500 border-gray-300 rounded'}
+_CHECKBOX_INDIGO = {'class': 'h-4 w-4 text-indigo-600 focus:ring-indigo-500 border-gray-300 rounded'}
+
+# Static choice lists for the booking forms
+_APPOINTMENT_TYPE_CHOICES = (
+    ('consultation', 'First Consultation - New patient inquiry'),
+    ('follow_up', 'Follow-up - I have consulted before'),
+    ('pre_op', 'Pre-operative - Surgery preparation discussion'),
+    ('post_op', 'Post-operative - Recovery check-in'),
+)
+
+_CONSULTATION_TYPE_CHOICES = (
+    ('video', 'Video Call (Zoom/WhatsApp)'),
+    ('phone', 'Phone Call'),
+    ('whatsapp', 'WhatsApp Chat'),
+    ('in_clinic', 'In-Person at Clinic'),
+)
+
+_HEIGHT_GAIN_CHOICES = (
+    ('3-5', '3-5 cm'),
+    ('5-8', '5-8 cm'),
+    ('8-10', '8-10 cm'),
+    ('10+', '10+ cm'),
+    ('unsure', 'Not sure yet'),
+)
+
+_CONSULT_PROCEDURE_CHOICES = (
+    ('ilizarov', 'Ilizarov Method'),
+    ('lon', 'LON Method'),
+    ('internal', 'Internal Nail (Precice/STRYDE)'),
+    ('unsure', 'Need guidance'),
+)
+
+_REFERRAL_SOURCE_CHOICES = (
+    ('', 'Select an option'),
+    ('google', 'Google Search'),
+    ('youtube', 'YouTube'),
+    ('instagram', 'Instagram'),
+    ('facebook', 'Facebook'),
+    ('tiktok', 'TikTok'),
+    ('friend', 'Friend/Family'),
+    ('forum', 'Online Forum'),
+    ('other', 'Other'),
+)
+
+_CALLBACK_TIME_CHOICES = (
+    ('asap', 'As soon as possible'),
+    ('morning', 'Morning'),
+    ('afternoon', 'Afternoon'),
+    ('evening', 'Evening'),
+)
+
+_VIDEO_PROCEDURE_CHOICES = (
+    ('undecided', 'Not sure yet'),
+    ('ilizarov', 'Ilizarov (External Fixator)'),
+    ('internal', 'Internal Lengthening Nail'),
+    ('lon', 'LON Method'),
+)
+
+# Timezone choices offered on the booking forms, built once at import time
+_CONSULT_TZ_CHOICES = tuple(
+    (tz, tz.replace('_', ' ')) for tz in (
+        'Asia/Karachi',  # Pakistan
+        'UTC',
+        'US/Eastern',
+        'US/Pacific',
+        'Europe/London',
+        'Europe/Paris',
+        'Europe/Berlin',
+        'Asia/Dubai',
+        'Asia/Riyadh',
+        'Asia/Kolkata',
+        'Asia/Singapore',
+        'Australia/Sydney',
+        'America/New_York',
+        'America/Los_Angeles',
+        'America/Chicago',
+    )
+)
+
+_VIDEO_TZ_CHOICES = (
+    ('UTC', 'UTC'),
+    ('Asia/Karachi', 'Pakistan (PKT)'),
+    ('Asia/Dubai', 'Dubai (GST)'),
+    ('Asia/Riyadh', 'Saudi Arabia (AST)'),
+    ('Europe/London', 'London (GMT/BST)'),
+    ('Europe/Paris', 'Paris (CET)'),
+    ('America/New_York', 'New York (EST)'),
+    ('America/Los_Angeles', 'Los Angeles (PST)'),
+    ('Asia/Tokyo', 'Tokyo (JST)'),
+    ('Australia/Sydney', 'Sydney (AEST)'),
+)
 
 
 class ConsultationBookingForm(forms.Form):
@@ -9,15 +106,8 @@ class ConsultationBookingForm(forms.Form):
     
     # Appointment Type - What the patient is booking for
     appointment_type = forms.ChoiceField(
-        choices=[
-            ('consultation', 'First Consultation - New patient inquiry'),
-            ('follow_up', 'Follow-up - I have consulted before'),
-            ('pre_op', 'Pre-operative - Surgery preparation discussion'),
-            ('post_op', 'Post-operative - Recovery check-in'),
-        ],
-        widget=forms.RadioSelect(attrs={
-            'class': 'mr-2 text-teal-600 focus:ring-teal-500',
-        }),
+        choices=_APPOINTMENT_TYPE_CHOICES,
+        widget=forms.RadioSelect(attrs=_RADIO_TEAL),
         initial='consultation'
     )
     
@@ -25,14 +115,14 @@ class ConsultationBookingForm(forms.Form):
     full_name = forms.CharField(
         max_length=200,
         widget=forms.TextInput(attrs={
-            'class': 'w-full px-4 py-3 border border-gray-300 rounded-lg focus:ring-2 focus:ring-teal-500 focus:border-teal-500',
+            **_INPUT_TEAL,
             'placeholder': 'Your full name',
         })
     )
     
     email = forms.EmailField(
         widget=forms.EmailInput(attrs={
-            'class': 'w-full px-4 py-3 border border-gray-300 rounded-lg focus:ring-2 focus:ring-teal-500 focus:border-teal-500',
+            **_INPUT_TEAL,
             'placeholder': 'your.email@example.com',
         })
     )
@@ -40,7 +130,7 @@ class ConsultationBookingForm(forms.Form):
     phone = forms.CharField(
         max_length=20,
         widget=forms.TextInput(attrs={
-            'class': 'w-full px-4 py-3 border border-gray-300 rounded-lg focus:ring-2 focus:ring-teal-500 focus:border-teal-500',
+            **_INPUT_TEAL,
             'placeholder': '+92 301 5943329',
         })
     )
@@ -48,30 +138,23 @@ class ConsultationBookingForm(forms.Form):
     country = forms.CharField(
         max_length=100,
         widget=forms.TextInput(attrs={
-            'class': 'w-full px-4 py-3 border border-gray-300 rounded-lg focus:ring-2 focus:ring-teal-500 focus:border-teal-500',
+            **_INPUT_TEAL,
             'placeholder': 'Your country',
         })
     )
     
     # Timezone for scheduling
     patient_timezone = forms.ChoiceField(
-        choices=[],
+        choices=_CONSULT_TZ_CHOICES,
         widget=forms.Select(attrs={
-            'class': 'w-full px-4 py-3 border border-gray-300 rounded-lg focus:ring-2 focus:ring-teal-500 focus:border-teal-500',
+            **_INPUT_TEAL,
             'x-model': 'selectedTimezone',
         })
     )
     
     consultation_type = forms.ChoiceField(
-        choices=[
-            ('video', 'Video Call (Zoom/WhatsApp)'),
-            ('phone', 'Phone Call'),
-            ('whatsapp', 'WhatsApp Chat'),
-            ('in_clinic', 'In-Person at Clinic'),
-        ],
-        widget=forms.RadioSelect(attrs={
-            'class': 'mr-2 text-teal-600 focus:ring-teal-500',
-        })
+        choices=_CONSULTATION_TYPE_CHOICES,
+        widget=forms.RadioSelect(attrs=_RADIO_TEAL)
     )
     
     # Medical information
@@ -79,40 +162,25 @@ class ConsultationBookingForm(forms.Form):
         max_length=20,
         required=False,
         widget=forms.TextInput(attrs={
-            'class': 'w-full px-4 py-3 border border-gray-300 rounded-lg focus:ring-2 focus:ring-teal-500 focus:border-teal-500',
+            **_INPUT_TEAL,
             'placeholder': 'e.g., 165 cm or 5\'5"',
         })
     )
     
     desired_height_gain = forms.ChoiceField(
-        choices=[
-            ('3-5', '3-5 cm'),
-            ('5-8', '5-8 cm'),
-            ('8-10', '8-10 cm'),
-            ('10+', '10+ cm'),
-            ('unsure', 'Not sure yet'),
-        ],
-        widget=forms.Select(attrs={
-            'class': 'w-full px-4 py-3 border border-gray-300 rounded-lg focus:ring-2 focus:ring-teal-500 focus:border-teal-500',
-        })
+        choices=_HEIGHT_GAIN_CHOICES,
+        widget=forms.Select(attrs=_INPUT_TEAL)
     )
     
     procedure_interest = forms.ChoiceField(
-        choices=[
-            ('ilizarov', 'Ilizarov Method'),
-            ('lon', 'LON Method'),
-            ('internal', 'Internal Nail (Precice/STRYDE)'),
-            ('unsure', 'Need guidance'),
-        ],
-        widget=forms.Select(attrs={
-            'class': 'w-full px-4 py-3 border border-gray-300 rounded-lg focus:ring-2 focus:ring-teal-500 focus:border-teal-500',
-        })
+        choices=_CONSULT_PROCEDURE_CHOICES,
+        widget=forms.Select(attrs=_INPUT_TEAL)
     )
     
     medical_conditions = forms.CharField(
         required=False,
         widget=forms.Textarea(attrs={
-            'class': 'w-full px-4 py-3 border border-gray-300 rounded-lg focus:ring-2 focus:ring-teal-500 focus:border-teal-500',
+            **_INPUT_TEAL,
             'placeholder': 'Any relevant medical conditions (optional)',
             'rows': 3,
         })
@@ -121,7 +189,7 @@ class ConsultationBookingForm(forms.Form):
     questions = forms.CharField(
         required=False,
         widget=forms.Textarea(attrs={
-            'class': 'w-full px-4 py-3 border border-gray-300 rounded-lg focus:ring-2 focus:ring-teal-500 focus:border-teal-500',
+            **_INPUT_TEAL,
             'placeholder': 'Any specific questions you would like answered?',
             'rows': 4,
         })
@@ -130,60 +198,20 @@ class ConsultationBookingForm(forms.Form):
     # How did you hear about us
     referral_source = forms.ChoiceField(
         required=False,
-        choices=[
-            ('', 'Select an option'),
-            ('google', 'Google Search'),
-            ('youtube', 'YouTube'),
-            ('instagram', 'Instagram'),
-            ('facebook', 'Facebook'),
-            ('tiktok', 'TikTok'),
-            ('friend', 'Friend/Family'),
-            ('forum', 'Online Forum'),
-            ('other', 'Other'),
-        ],
-        widget=forms.Select(attrs={
-            'class': 'w-full px-4 py-3 border border-gray-300 rounded-lg focus:ring-2 focus:ring-teal-500 focus:border-teal-500',
-        })
+        choices=_REFERRAL_SOURCE_CHOICES,
+        widget=forms.Select(attrs=_INPUT_TEAL)
     )
     
     # Consent
     privacy_consent = forms.BooleanField(
         required=True,
-        widget=forms.CheckboxInput(attrs={
-            'class': 'h-4 w-4 text-teal-600 focus:ring-teal-500 border-gray-300 rounded',
-        })
+        widget=forms.CheckboxInput(attrs=_CHECKBOX_TEAL)
     )
     
     marketing_consent = forms.BooleanField(
         required=False,
-        widget=forms.CheckboxInput(attrs={
-            'class': 'h-4 w-4 text-teal-600 focus:ring-teal-500 border-gray-300 rounded',
-        })
+        widget=forms.CheckboxInput(attrs=_CHECKBOX_TEAL)
     )
-    
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        # Populate timezone choices
-        common_timezones = [
-            'Asia/Karachi',  # Pakistan
-            'UTC',
-            'US/Eastern',
-            'US/Pacific',
-            'Europe/London',
-            'Europe/Paris',
-            'Europe/Berlin',
-            'Asia/Dubai',
-            'Asia/Riyadh',
-            'Asia/Kolkata',
-            'Asia/Singapore',
-            'Australia/Sydney',
-            'America/New_York',
-            'America/Los_Angeles',
-            'America/Chicago',
-        ]
-        self.fields['patient_timezone'].choices = [
-            (tz, tz.replace('_', ' ')) for tz in common_timezones
-        ]
 
 
 class ContactForm(forms.Form):
@@ -192,14 +220,14 @@ class ContactForm(forms.Form):
     name = forms.CharField(
         max_length=100,
         widget=forms.TextInput(attrs={
-            'class': 'w-full px-4 py-3 border border-gray-300 rounded-lg focus:ring-2 focus:ring-teal-500 focus:border-teal-500',
+            **_INPUT_TEAL,
             'placeholder': 'Your name',
         })
     )
     
     email = forms.EmailField(
         widget=forms.EmailInput(attrs={
-            'class': 'w-full px-4 py-3 border border-gray-300 rounded-lg focus:ring-2 focus:ring-teal-500 focus:border-teal-500',
+            **_INPUT_TEAL,
             'placeholder': 'your.email@example.com',
         })
     )
@@ -207,14 +235,14 @@ class ContactForm(forms.Form):
     subject = forms.CharField(
         max_length=200,
         widget=forms.TextInput(attrs={
-            'class': 'w-full px-4 py-3 border border-gray-300 rounded-lg focus:ring-2 focus:ring-teal-500 focus:border-teal-500',
+            **_INPUT_TEAL,
             'placeholder': 'Subject of your message',
         })
     )
     
     message = forms.CharField(
         widget=forms.Textarea(attrs={
-            'class': 'w-full px-4 py-3 border border-gray-300 rounded-lg focus:ring-2 focus:ring-teal-500 focus:border-teal-500',
+            **_INPUT_TEAL,
             'placeholder': 'Your message...',
             'rows': 6,
         })
@@ -222,9 +250,7 @@ class ContactForm(forms.Form):
     
     privacy_consent = forms.BooleanField(
         required=True,
-        widget=forms.CheckboxInput(attrs={
-            'class': 'h-4 w-4 text-teal-600 focus:ring-teal-500 border-gray-300 rounded',
-        })
+        widget=forms.CheckboxInput(attrs=_CHECKBOX_TEAL)
     )
 
 
@@ -240,12 +266,7 @@ class QuickCallbackForm(forms.Form):
     )
     
     best_time = forms.ChoiceField(
-        choices=[
-            ('asap', 'As soon as possible'),
-            ('morning', 'Morning'),
-            ('afternoon', 'Afternoon'),
-            ('evening', 'Evening'),
-        ],
+        choices=_CALLBACK_TIME_CHOICES,
         widget=forms.Select(attrs={
             'class': 'px-4 py-3 border border-gray-300 rounded-lg focus:ring-2 focus:ring-teal-500 focus:border-teal-500',
         })
@@ -259,14 +280,14 @@ class VideoConsultationForm(forms.Form):
     patient_name = forms.CharField(
         max_length=200,
         widget=forms.TextInput(attrs={
-            'class': 'w-full px-4 py-3 border border-gray-300 rounded-lg focus:ring-2 focus:ring-indigo-500 focus:border-indigo-500',
+            **_INPUT_INDIGO,
             'placeholder': 'Your full name',
         })
     )
     
     patient_email = forms.EmailField(
         widget=forms.EmailInput(attrs={
-            'class': 'w-full px-4 py-3 border border-gray-300 rounded-lg focus:ring-2 focus:ring-indigo-500 focus:border-indigo-500',
+            **_INPUT_INDIGO,
             'placeholder': 'your.email@example.com',
         })
     )
@@ -275,7 +296,7 @@ class VideoConsultationForm(forms.Form):
         max_length=20,
         required=False,
         widget=forms.TextInput(attrs={
-            'class': 'w-full px-4 py-3 border border-gray-300 rounded-lg focus:ring-2 focus:ring-indigo-500 focus:border-indigo-500',
+            **_INPUT_INDIGO,
             'placeholder': '+92 301 5943329',
         })
     )
@@ -284,38 +305,36 @@ class VideoConsultationForm(forms.Form):
         max_length=100,
         required=False,
         widget=forms.TextInput(attrs={
-            'class': 'w-full px-4 py-3 border border-gray-300 rounded-lg focus:ring-2 focus:ring-indigo-500 focus:border-indigo-500',
+            **_INPUT_INDIGO,
             'placeholder': 'Your country',
         })
     )
     
     patient_timezone = forms.ChoiceField(
-        choices=[],
+        choices=_VIDEO_TZ_CHOICES,
         required=False,
-        widget=forms.Select(attrs={
-            'class': 'w-full px-4 py-3 border border-gray-300 rounded-lg focus:ring-2 focus:ring-indigo-500 focus:border-indigo-500',
-        })
+        widget=forms.Select(attrs=_INPUT_INDIGO)
     )
     
     # Scheduling
     scheduled_date = forms.DateField(
         widget=forms.DateInput(attrs={
             'type': 'date',
-            'class': 'w-full px-4 py-3 border border-gray-300 rounded-lg focus:ring-2 focus:ring-indigo-500 focus:border-indigo-500',
+            **_INPUT_INDIGO,
         })
     )
     
     scheduled_time = forms.TimeField(
         widget=forms.TimeInput(attrs={
             'type': 'time',
-            'class': 'w-full px-4 py-3 border border-gray-300 rounded-lg focus:ring-2 focus:ring-indigo-500 focus:border-indigo-500',
+            **_INPUT_INDIGO,
         })
     )
     
     # Medical Information
     reason = forms.CharField(
         widget=forms.Textarea(attrs={
-            'class': 'w-full px-4 py-3 border border-gray-300 rounded-lg focus:ring-2 focus:ring-indigo-500 focus:border-indigo-500',
+            **_INPUT_INDIGO,
             'placeholder': 'Briefly describe the reason for your consultation...',
             'rows': 3,
         })
@@ -325,7 +344,7 @@ class VideoConsultationForm(forms.Form):
         max_length=20,
         required=False,
         widget=forms.TextInput(attrs={
-            'class': 'w-full px-4 py-3 border border-gray-300 rounded-lg focus:ring-2 focus:ring-indigo-500 focus:border-indigo-500',
+            **_INPUT_INDIGO,
             'placeholder': 'e.g., 165 cm or 5\'5"',
         })
     )
@@ -334,27 +353,20 @@ class VideoConsultationForm(forms.Form):
         max_length=20,
         required=False,
         widget=forms.TextInput(attrs={
-            'class': 'w-full px-4 py-3 border border-gray-300 rounded-lg focus:ring-2 focus:ring-indigo-500 focus:border-indigo-500',
+            **_INPUT_INDIGO,
             'placeholder': 'e.g., 6-8 cm',
         })
     )
     
     procedure_interest = forms.ChoiceField(
-        choices=[
-            ('undecided', 'Not sure yet'),
-            ('ilizarov', 'Ilizarov (External Fixator)'),
-            ('internal', 'Internal Lengthening Nail'),
-            ('lon', 'LON Method'),
-        ],
-        widget=forms.Select(attrs={
-            'class': 'w-full px-4 py-3 border border-gray-300 rounded-lg focus:ring-2 focus:ring-indigo-500 focus:border-indigo-500',
-        })
+        choices=_VIDEO_PROCEDURE_CHOICES,
+        widget=forms.Select(attrs=_INPUT_INDIGO)
     )
     
     medical_notes = forms.CharField(
         required=False,
         widget=forms.Textarea(attrs={
-            'class': 'w-full px-4 py-3 border border-gray-300 rounded-lg focus:ring-2 focus:ring-indigo-500 focus:border-indigo-500',
+            **_INPUT_INDIGO,
             'placeholder': 'Any medical conditions, previous surgeries, or medications we should know about...',
             'rows': 3,
         })
@@ -363,31 +375,11 @@ class VideoConsultationForm(forms.Form):
     # Consent
     terms_consent = forms.BooleanField(
         required=True,
-        widget=forms.CheckboxInput(attrs={
-            'class': 'h-4 w-4 text-indigo-600 focus:ring-indigo-500 border-gray-300 rounded',
-        })
+        widget=forms.CheckboxInput(attrs=_CHECKBOX_INDIGO)
     )
     
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        # Populate timezone choices
-        common_timezones = [
-            ('UTC', 'UTC'),
-            ('Asia/Karachi', 'Pakistan (PKT)'),
-            ('Asia/Dubai', 'Dubai (GST)'),
-            ('Asia/Riyadh', 'Saudi Arabia (AST)'),
-            ('Europe/London', 'London (GMT/BST)'),
-            ('Europe/Paris', 'Paris (CET)'),
-            ('America/New_York', 'New York (EST)'),
-            ('America/Los_Angeles', 'Los Angeles (PST)'),
-            ('Asia/Tokyo', 'Tokyo (JST)'),
-            ('Australia/Sydney', 'Sydney (AEST)'),
-        ]
-        self.fields['patient_timezone'].choices = common_timezones
-    
     def clean_scheduled_date(self):
         date = self.cleaned_data['scheduled_date']
-        from django.utils import timezone as tz
-        if date < tz.now().date():
+        if date < timezone.now().date():
             raise forms.ValidationError('Please select a future date.')
         return date
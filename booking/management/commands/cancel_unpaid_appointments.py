@@ -6,6 +6,8 @@ Run this command periodically (e.g., via cron or Windows Task Scheduler):
 """
 
 from django.core.management.base import BaseCommand
+from django.db.models import Case, TextField, Value, When
+from django.db.models.functions import Concat
 from django.utils import timezone
 from booking.models import Appointment
 
@@ -32,29 +34,40 @@ class Command(BaseCommand):
             status__in=['pending', 'confirmed'],
             payment_deadline__lt=now,
             payment_status__in=['pending', 'submitted', 'failed']
-        ).select_related('patient__user')
+        )
         
-        count = overdue_appointments.count()
+        # Stream only the columns the listing prints, counting as we go
+        # instead of issuing a separate COUNT(*)
+        listing = overdue_appointments.select_related('patient__user').only(
+            'id', 'payment_deadline', 'patient__user__email'
+        )
+        count = 0
+        for appointment in listing.iterator(chunk_size=500):
+            if count == 0:
+                self.stdout.write('Overdue unpaid appointments:')
+            count += 1
+            patient_email = appointment.patient.user.email
+            deadline = appointment.payment_deadline
+            
+            self.stdout.write(f'  - Appointment #{appointment.id}: {patient_email} (deadline: {deadline})')
         
         if count == 0:
             self.stdout.write(self.style.SUCCESS('No overdue unpaid appointments found.'))
             return
         
-        self.stdout.write(f'Found {count} overdue unpaid appointment(s):')
+        self.stdout.write(f'Found {count} overdue unpaid appointment(s).')
         
-        for appointment in overdue_appointments:
-            patient_email = appointment.patient.user.email
-            deadline = appointment.payment_deadline
-            
-            self.stdout.write(f'  - Appointment #{appointment.id}: {patient_email} (deadline: {deadline})')
-            
-            if not dry_run:
-                appointment.status = 'cancelled'
-                appointment.doctor_notes = (
-                    (appointment.doctor_notes or '') + 
-                    f'\n[Auto-cancelled {now.strftime("%Y-%m-%d %H:%M")}: Payment deadline expired]'
-                ).strip()
-                appointment.save(update_fields=['status', 'doctor_notes'])
+        if not dry_run:
+            # Cancel all overdue appointments and append the note in a single UPDATE
+            note = f'[Auto-cancelled {now.strftime("%Y-%m-%d %H:%M")}: Payment deadline expired]'
+            count = overdue_appointments.update(
+                status='cancelled',
+                doctor_notes=Case(
+                    When(doctor_notes='', then=Value(note)),
+                    default=Concat('doctor_notes', Value(f'\n{note}')),
+                    output_field=TextField(),
+                ),
+            )
         
         if dry_run:
             self.stdout.write(self.style.WARNING(f'DRY RUN: Would have cancelled {count} appointment(s).'))
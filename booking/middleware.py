@@ -4,8 +4,26 @@ Middleware for booking app.
 Handles automatic status updates for appointments.
 """
 
-from django.utils import timezone
+import logging
+import threading
+import time
+
+from django.conf import settings
 from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+STATUS_UPDATE_INTERVAL = 300  # seconds
+
+# Path prefixes that trigger a status update
+_WATCHED_PREFIXES = ('/portal/', '/staff/')
+
+# Per-process throttle checked before the shared cache is consulted
+_LAST_STATUS_CHECK = [float('-inf')]
+_STATUS_CHECK_LOCK = threading.Lock()
 
 
 class AppointmentStatusMiddleware:
@@ -15,35 +33,44 @@ class AppointmentStatusMiddleware:
     - Cancels unpaid appointments past their deadline
     - Marks confirmed appointments as completed when their time passes
     
-    Runs at most once every 5 minutes to avoid performance issues.
+    Runs at most once every 5 minutes to avoid performance issues. Set
+    APPOINTMENT_SWEEP_IN_MIDDLEWARE = False once Celery beat runs the
+    periodic booking.tasks.update_appointment_statuses task; this middleware
+    then removes itself from the stack.
     """
     
     def __init__(self, get_response):
+        if not getattr(settings, 'APPOINTMENT_SWEEP_IN_MIDDLEWARE', True):
+            raise MiddlewareNotUsed
         self.get_response = get_response
     
     def __call__(self, request):
-        # Only run for authenticated users on relevant paths
-        if request.user.is_authenticated:
-            path = request.path
-            if path.startswith('/portal/') or path.startswith('/staff/'):
-                self._update_statuses_if_needed()
+        # Only run for authenticated users on relevant paths. Check the path
+        # first so other requests never load the session user.
+        if request.path.startswith(_WATCHED_PREFIXES) and request.user.is_authenticated:
+            self._update_statuses_if_needed()
         
-        response = self.get_response(request)
-        return response
+        return self.get_response(request)
     
     def _update_statuses_if_needed(self):
         """Run status updates at most once every 5 minutes."""
+        mono = time.monotonic()
+        with _STATUS_CHECK_LOCK:
+            if mono - _LAST_STATUS_CHECK[0] < STATUS_UPDATE_INTERVAL:
+                return
+            _LAST_STATUS_CHECK[0] = mono
+        
         cache_key = 'appointment_status_last_update'
         last_update = cache.get(cache_key)
         
         now = timezone.now()
         
         # Only update if 5 minutes have passed since last update
-        if last_update is None or (now - last_update).total_seconds() > 300:
+        if last_update is None or (now - last_update).total_seconds() > STATUS_UPDATE_INTERVAL:
             try:
                 from booking.models import Appointment
                 Appointment.auto_update_statuses()
                 cache.set(cache_key, now, timeout=600)  # Cache for 10 minutes
             except Exception:
-                # Silently fail - don't break the request
-                pass
+                # Don't break the request, but don't hide the failure either
+                logger.exception("Appointment status sweep failed")
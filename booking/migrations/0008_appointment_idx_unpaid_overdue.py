@@ -0,0 +1,23 @@
+# Generated by Django 6.0 on 2026-10-16 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("booking", "0007_add_patient_full_name"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="appointment",
+            index=models.Index(
+                condition=models.Q(
+                    ("status__in", ["pending", "confirmed"]),
+                    ("payment_status__in", ["pending", "submitted", "failed"]),
+                ),
+                fields=["payment_deadline"],
+                name="idx_unpaid_overdue",
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-16 12:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("booking", "0008_appointment_idx_unpaid_overdue"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="appointment",
+            index=models.Index(
+                fields=["time_slot", "status"], name="idx_slot_status"
+            ),
+        ),
+    ]
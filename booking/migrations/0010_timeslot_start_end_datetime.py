@@ -0,0 +1,40 @@
+# Generated by Django 6.0 on 2026-10-16 13:00
+
+from datetime import datetime
+
+import pytz
+from django.db import migrations, models
+
+
+def populate_slot_datetimes(apps, schema_editor):
+    TimeSlot = apps.get_model("booking", "TimeSlot")
+    slots = list(TimeSlot.objects.all())
+    for slot in slots:
+        slot_tz = pytz.timezone(slot.timezone)
+        slot.start_datetime = slot_tz.localize(datetime.combine(slot.date, slot.start_time))
+        slot.end_datetime = slot_tz.localize(datetime.combine(slot.date, slot.end_time))
+    TimeSlot.objects.bulk_update(slots, ["start_datetime", "end_datetime"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("booking", "0009_appointment_idx_slot_status"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="timeslot",
+            name="start_datetime",
+            field=models.DateTimeField(
+                blank=True, db_index=True, editable=False, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="timeslot",
+            name="end_datetime",
+            field=models.DateTimeField(
+                blank=True, db_index=True, editable=False, null=True
+            ),
+        ),
+        migrations.RunPython(populate_slot_datetimes, migrations.RunPython.noop),
+    ]
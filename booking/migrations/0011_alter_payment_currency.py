@@ -0,0 +1,19 @@
+# Generated by Django 6.0 on 2026-10-16 14:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("booking", "0010_timeslot_start_end_datetime"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="payment",
+            name="currency",
+            field=models.CharField(
+                choices=[("USD", "USD")], default="USD", max_length=3
+            ),
+        ),
+    ]
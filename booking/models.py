@@ -9,16 +9,64 @@ Models for appointment scheduling and patient management:
 - Payment
 """
 
-from django.db import models
+from django.db import connection, models, transaction
+from django.db.models.functions import Concat
 from django.contrib.auth import get_user_model
 from django.core.validators import RegexValidator
 from django.urls import reverse
 from django.utils import timezone
+from django.utils.functional import cached_property
+from functools import lru_cache
 import uuid
 import pytz
 
 User = get_user_model()
 
+AUTO_CANCEL_NOTE = '\n[Auto-cancelled: Payment deadline expired]'
+
+
+@lru_cache(maxsize=512)
+def _tz(name):
+    """Return the pytz timezone for an IANA name, cached per name."""
+    return pytz.timezone(name)
+
+
+# TimeSlot fields that start_datetime/end_datetime are derived from
+_SLOT_DATETIME_SOURCES = frozenset({'date', 'start_time', 'end_time', 'timezone'})
+
+
+class TimeSlotQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+        # bulk_create skips save(), so fill the derived datetimes here
+        objs = list(objs)
+        for obj in objs:
+            obj._set_datetimes()
+        return super().bulk_create(objs, *args, **kwargs)
+    
+    def update(self, **kwargs):
+        """Update, then re-derive start/end_datetime if their sources changed."""
+        if _SLOT_DATETIME_SOURCES.isdisjoint(kwargs):
+            return super().update(**kwargs)
+        with transaction.atomic(using=self.db):
+            pks = list(self.values_list('pk', flat=True))
+            rows = super().update(**kwargs)
+            slots = list(self.model._base_manager.using(self.db).filter(pk__in=pks))
+            for slot in slots:
+                slot._set_datetimes()
+            self.model._base_manager.using(self.db).bulk_update(
+                slots, ['start_datetime', 'end_datetime'], batch_size=500
+            )
+        return rows
+    
+    def with_booking_counts(self):
+        """Annotate each slot's active booking count in the same query."""
+        return self.annotate(
+            _current_bookings=models.Count(
+                'appointments',
+                filter=models.Q(appointments__status__in=['confirmed', 'pending']),
+            )
+        )
+
 
 class TimeSlot(models.Model):
     """Available appointment time slots."""
@@ -43,6 +91,14 @@ class TimeSlot(models.Model):
     )
     max_bookings = models.IntegerField(default=1)
     
+    # Denormalized from date/start_time/end_time/timezone on save(),
+    # bulk_create() and update() so time-based filters can use an index
+    # instead of combining per row
+    start_datetime = models.DateTimeField(null=True, blank=True, editable=False, db_index=True)
+    end_datetime = models.DateTimeField(null=True, blank=True, editable=False, db_index=True)
+    
+    objects = TimeSlotQuerySet.as_manager()
+    
     class Meta:
         ordering = ['date', 'start_time']
         unique_together = [['date', 'start_time', 'timezone']]
@@ -52,9 +108,48 @@ class TimeSlot(models.Model):
     def __str__(self):
         return f"{self.date} {self.start_time}-{self.end_time} ({self.timezone})"
     
-    @property
+    def save(self, *args, **kwargs):
+        self._set_datetimes()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'start_datetime', 'end_datetime'}
+        super().save(*args, **kwargs)
+    
+    def _localize(self, time_field):
+        """Combine date with ``time_field`` as an aware datetime in the slot timezone."""
+        # Views may pass raw form strings, so coerce before combining
+        date = self._meta.get_field('date').to_python(self.date)
+        value = self._meta.get_field(time_field).to_python(getattr(self, time_field))
+        return _tz(self.timezone).localize(timezone.datetime.combine(date, value))
+    
+    def _set_datetimes(self):
+        self.start_datetime = self._localize('start_time')
+        self.end_datetime = self._localize('end_time')
+    
+    def get_start_datetime(self):
+        """Aware slot start, derived from date/start_time if not stored."""
+        return self.start_datetime or self._localize('start_time')
+    
+    def get_end_datetime(self):
+        """Aware slot end, derived from date/end_time if not stored."""
+        return self.end_datetime or self._localize('end_time')
+    
+    @cached_property
+    def display_date_str(self):
+        """Slot date as shown in notifications, e.g. 'March 05, 2026'."""
+        return self.date.strftime("%B %d, %Y")
+    
+    @cached_property
+    def display_time_str(self):
+        """Slot start time as shown in notifications, e.g. '02:30 PM'."""
+        return self.start_time.strftime("%I:%M %p")
+    
+    @cached_property
     def current_bookings(self):
-        """Count current bookings for this slot."""
+        """Count current bookings for this slot (once per instance)."""
+        if hasattr(self, '_current_bookings'):
+            # Annotated by TimeSlot.objects.with_booking_counts()
+            return self._current_bookings
         return self.appointments.filter(status__in=['confirmed', 'pending']).count()
     
     @property
@@ -345,6 +440,20 @@ class Appointment(models.Model):
         ordering = ['time_slot__date', 'time_slot__start_time']
         verbose_name = "Appointment"
         verbose_name_plural = "Appointments"
+        indexes = [
+            # Active, unpaid appointments swept by cancel_unpaid_appointments
+            # and auto_update_statuses
+            models.Index(
+                fields=['payment_deadline'],
+                condition=(
+                    models.Q(status__in=['pending', 'confirmed'])
+                    & models.Q(payment_status__in=['pending', 'submitted', 'failed'])
+                ),
+                name='idx_unpaid_overdue',
+            ),
+            # Active booking counts per slot (TimeSlot.current_bookings)
+            models.Index(fields=['time_slot', 'status'], name='idx_slot_status'),
+        ]
     
     def __str__(self):
         if self.time_slot:
@@ -368,21 +477,22 @@ class Appointment(models.Model):
         """Cancel appointment if payment is overdue."""
         if self.is_payment_overdue() and self.status not in ['cancelled', 'completed']:
             self.status = 'cancelled'
-            self.doctor_notes = (self.doctor_notes or '') + '\n[Auto-cancelled: Payment deadline expired]'
+            self.doctor_notes = (self.doctor_notes or '') + AUTO_CANCEL_NOTE
             self.save(update_fields=['status', 'doctor_notes'])
             return True
         return False
     
     def is_past_appointment(self):
-        """Check if appointment time has passed."""
+        """
+        Check if appointment time has passed.
+        
+        The slot end is read in the slot's own timezone, not the active
+        timezone.
+        """
         if not self.time_slot:
             return False
-        from datetime import datetime, timedelta
-        slot_end = timezone.make_aware(
-            datetime.combine(self.time_slot.date, self.time_slot.end_time)
-        )
         # Consider appointment past if end time + 1 hour has passed
-        return timezone.now() > slot_end + timedelta(hours=1)
+        return timezone.now() > self.time_slot.get_end_datetime() + timezone.timedelta(hours=1)
     
     def complete_if_past(self):
         """Mark appointment as completed if time has passed."""
@@ -395,7 +505,10 @@ class Appointment(models.Model):
     @classmethod
     def auto_update_statuses(cls):
         """Auto-update all appointments: cancel unpaid, complete past ones."""
-        from datetime import datetime, timedelta
+        from datetime import timedelta
+        # Imported here, once per sweep, to keep portal.models (pulled in by
+        # notification_helpers) out of this module's import-time graph
+        from booking.notification_helpers import notify_appointments_completed
         now = timezone.now()
         
         # 1. Cancel unpaid appointments past deadline
@@ -403,55 +516,79 @@ class Appointment(models.Model):
             status__in=['pending', 'confirmed'],
             payment_deadline__lt=now,
             payment_status__in=['pending', 'submitted', 'failed']
-        ).update(status='cancelled')
+        ).update(
+            status='cancelled',
+            # Append the note in SQL, as cancel_if_unpaid does in Python
+            doctor_notes=Concat('doctor_notes', models.Value(AUTO_CANCEL_NOTE), output_field=models.TextField()),
+        )
         
-        # 2. Complete past confirmed appointments (with time slots)
-        past_completed = 0
-        past_appointments = cls.objects.filter(
-            status='confirmed',
-            time_slot__isnull=False
-        ).select_related('time_slot', 'patient__user')
+        # 2. Complete past confirmed appointments (with time slots), i.e.
+        # slots that ended more than an hour ago
+        cutoff = now - timedelta(hours=1)
+        completed = cls._complete_past(cutoff)
         
-        for apt in past_appointments:
-            slot_end = timezone.make_aware(
-                datetime.combine(apt.time_slot.date, apt.time_slot.end_time)
-            )
-            if now > slot_end + timedelta(hours=1):
-                apt.status = 'completed'
-                apt.save(update_fields=['status'])
-                # Send notification to patient
-                try:
-                    from booking.notification_helpers import notify_appointment_completed
-                    notify_appointment_completed(apt)
-                except Exception:
-                    pass  # Don't fail auto-update if notification fails
-                past_completed += 1
+        if completed:
+            # Notify patients with one bulk insert
+            try:
+                notify_appointments_completed(completed)
+            except Exception:
+                pass  # Don't fail auto-update if notification fails
+        
+        return {'unpaid_cancelled': unpaid_cancelled, 'past_completed': len(completed)}
+    
+    @classmethod
+    def _complete_past(cls, cutoff):
+        """
+        Mark confirmed appointments whose slot ended before ``cutoff`` as
+        completed. Returns ``(appointment_id, user_id, slot_date)`` rows for
+        the notifications.
+        """
+        if connection.vendor == 'postgresql':
+            # One round trip: UPDATE ... FROM joins the slot and patient and
+            # RETURNING hands back what the notifications need
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"""
+                    UPDATE {cls._meta.db_table} AS a
+                    SET status = 'completed'
+                    FROM {TimeSlot._meta.db_table} AS t, {Patient._meta.db_table} AS p
+                    WHERE a.time_slot_id = t.id
+                      AND a.patient_id = p.id
+                      AND a.status = 'confirmed'
+                      AND t.end_datetime < %s
+                    RETURNING a.id, p.user_id, t.date
+                    """,
+                    [cutoff],
+                )
+                return cursor.fetchall()
         
-        return {'unpaid_cancelled': unpaid_cancelled, 'past_completed': past_completed}
+        with transaction.atomic():
+            # Lock the rows being completed; rows another worker already
+            # holds are skipped and picked up by the next sweep
+            completed = list(
+                cls.objects.select_for_update(skip_locked=True, of=('self',)).filter(
+                    status='confirmed',
+                    time_slot__end_datetime__lt=cutoff,
+                ).values_list('id', 'patient__user_id', 'time_slot__date')
+            )
+            if completed:
+                cls.objects.filter(id__in=[row[0] for row in completed]).update(status='completed')
+        return completed
     
     def get_patient_local_time(self):
         """Convert appointment time to patient's timezone."""
-        slot_tz = pytz.timezone(self.time_slot.timezone)
-        patient_tz = pytz.timezone(self.patient.timezone)
-        
-        # Combine date and time
-        naive_datetime = timezone.datetime.combine(
-            self.time_slot.date,
-            self.time_slot.start_time
-        )
-        
-        # Localize to slot timezone
-        slot_datetime = slot_tz.localize(naive_datetime)
-        
-        # Convert to patient timezone
-        patient_datetime = slot_datetime.astimezone(patient_tz)
-        
-        return patient_datetime
+        # The slot's date/start_time localized to the slot timezone
+        return self.time_slot.get_start_datetime().astimezone(_tz(self.patient.timezone))
     
-    def send_confirmation_email(self):
-        """Send appointment confirmation email with ICS file."""
-        # TODO: Implement with Celery task
-        pass
+    def send_confirmation_email(self, connection=None):
+        """
+        Send the appointment confirmation email. Returns True if it was sent.
+        
+        Pass an open mail ``connection`` when sending a batch so every
+        message reuses it.
+        """
+        from booking.notifications import send_appointment_confirmed
+        return send_appointment_confirmed(self, connection=connection)
     
     def send_reminder(self, hours_before):
         """Send appointment reminder."""
@@ -543,20 +680,18 @@ class VideoConsultation(models.Model):
     def get_join_url(self):
         return reverse('booking:video_consultation_join', kwargs={'pk': self.pk})
     
-    @property
+    @cached_property
     def scheduled_datetime(self):
-        """Get combined datetime object."""
-        return timezone.datetime.combine(self.scheduled_date, self.scheduled_time)
+        """Get the aware scheduled datetime (computed once per instance)."""
+        return timezone.make_aware(
+            timezone.datetime.combine(self.scheduled_date, self.scheduled_time),
+            timezone.get_current_timezone()
+        )
     
     @property
     def is_upcoming(self):
         """Check if consultation is in the future."""
-        now = timezone.now()
-        scheduled = timezone.make_aware(
-            self.scheduled_datetime,
-            timezone.get_current_timezone()
-        )
-        return scheduled > now
+        return self.scheduled_datetime > timezone.now()
     
     @property
     def can_join(self):
@@ -565,10 +700,7 @@ class VideoConsultation(models.Model):
             return False
         
         now = timezone.now()
-        scheduled = timezone.make_aware(
-            self.scheduled_datetime,
-            timezone.get_current_timezone()
-        )
+        scheduled = self.scheduled_datetime
         
         # Allow joining 10 minutes before
         earliest_join = scheduled - timezone.timedelta(minutes=10)
@@ -639,7 +771,10 @@ class Payment(models.Model):
     
     # Payment details
     amount = models.DecimalField(max_digits=10, decimal_places=2)
-    currency = models.CharField(max_length=3, default='USD')
+    CURRENCY_CHOICES = [
+        ('USD', 'USD'),
+    ]
+    currency = models.CharField(max_length=3, choices=CURRENCY_CHOICES, default='USD')
     
     # Stripe integration
     stripe_session_id = models.CharField(max_length=255, blank=True)
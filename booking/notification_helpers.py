@@ -11,24 +11,33 @@ User = get_user_model()
 
 
 def notify_appointment_submitted(appointment):
-    """Notify patient that their appointment request was submitted."""
-    Notification.create_for_user(
-        user=appointment.patient.user,
-        notification_type='appointment_submitted',
-        title='Appointment Request Submitted',
-        message=f'Your consultation request #{appointment.id} has been submitted. Please complete payment within 48 hours.',
-        appointment=appointment,
-        action_url=f'/portal/appointments/{appointment.id}/payment/'
-    )
+    """Notify patient that their appointment request was submitted, and staff about it."""
+    patient = appointment.patient
+    staff_message = f'New consultation request from {patient.full_name or patient.user.email}.'
     
-    # Notify staff about new appointment
-    Notification.create_for_staff(
-        notification_type='new_appointment',
-        title='New Appointment Request',
-        message=f'New consultation request from {appointment.patient.full_name or appointment.patient.user.email}.',
-        appointment=appointment,
-        action_url=f'/staff/appointments/{appointment.id}/'
-    )
+    # Patient and staff rows go in together as one bulk INSERT
+    notifications = [
+        Notification(
+            user_id=patient.user_id,
+            notification_type='appointment_submitted',
+            title='Appointment Request Submitted',
+            message=f'Your consultation request #{appointment.id} has been submitted. Please complete payment within 48 hours.',
+            related_appointment=appointment,
+            action_url=f'/portal/appointments/{appointment.id}/payment/'
+        ),
+        *(
+            Notification(
+                user_id=user_id,
+                notification_type='new_appointment',
+                title='New Appointment Request',
+                message=staff_message,
+                related_appointment=appointment,
+                action_url=f'/staff/appointments/{appointment.id}/'
+            )
+            for user_id in Notification.staff_ids()
+        ),
+    ]
+    Notification.objects.bulk_create(notifications, batch_size=200)
 
 
 def notify_payment_submitted(appointment):
@@ -45,7 +54,7 @@ def notify_payment_submitted(appointment):
 def notify_payment_verified(appointment):
     """Notify patient that their payment was verified."""
     Notification.create_for_user(
-        user=appointment.patient.user,
+        user=appointment.patient.user_id,
         notification_type='payment_verified',
         title='Payment Verified',
         message=f'Your payment for appointment #{appointment.id} has been verified. A doctor will assign your time slot soon.',
@@ -62,7 +71,7 @@ def notify_payment_rejected(appointment, reason=None):
     message += ' Please resubmit payment.'
     
     Notification.create_for_user(
-        user=appointment.patient.user,
+        user=appointment.patient.user_id,
         notification_type='payment_rejected',
         title='Payment Verification Failed',
         message=message,
@@ -75,12 +84,12 @@ def notify_slot_assigned(appointment):
     """Notify patient that a time slot was assigned."""
     slot = appointment.time_slot
     if slot:
-        slot_str = f'{slot.date.strftime("%B %d, %Y")} at {slot.start_time.strftime("%I:%M %p")}'
+        slot_str = f'{slot.display_date_str} at {slot.display_time_str}'
     else:
         slot_str = 'TBD'
     
     Notification.create_for_user(
-        user=appointment.patient.user,
+        user=appointment.patient.user_id,
         notification_type='slot_assigned',
         title='Appointment Time Scheduled',
         message=f'Your appointment #{appointment.id} is scheduled for {slot_str}.',
@@ -93,12 +102,12 @@ def notify_appointment_confirmed(appointment):
     """Notify patient that their appointment is confirmed."""
     slot = appointment.time_slot
     if slot:
-        slot_str = f'{slot.date.strftime("%B %d, %Y")} at {slot.start_time.strftime("%I:%M %p")}'
+        slot_str = f'{slot.display_date_str} at {slot.display_time_str}'
     else:
         slot_str = 'Check your portal for details'
     
     Notification.create_for_user(
-        user=appointment.patient.user,
+        user=appointment.patient.user_id,
         notification_type='appointment_confirmed',
         title='Appointment Confirmed!',
         message=f'Your consultation appointment is confirmed for {slot_str}.',
@@ -114,7 +123,7 @@ def notify_appointment_cancelled(appointment, reason=None):
         message += f' Reason: {reason}'
     
     Notification.create_for_user(
-        user=appointment.patient.user,
+        user=appointment.patient.user_id,
         notification_type='appointment_cancelled',
         title='Appointment Cancelled',
         message=message,
@@ -123,11 +132,10 @@ def notify_appointment_cancelled(appointment, reason=None):
     )
 
 
-def notify_appointment_completed(appointment):
-    """Notify patient that their appointment has been completed."""
-    slot = appointment.time_slot
-    if slot:
-        slot_str = f'{slot.date.strftime("%B %d, %Y")}'
+def _appointment_completed_notification(appointment_id, user_id, slot_date):
+    """Build (without saving) the patient notification for a completed appointment."""
+    if slot_date:
+        slot_str = f'{slot_date.strftime("%B %d, %Y")}'
     else:
         slot_str = ''
     
@@ -136,11 +144,31 @@ def notify_appointment_completed(appointment):
         message += f' on {slot_str}'
     message += ' has been completed. Thank you for choosing Hills Clinic!'
     
-    Notification.create_for_user(
-        user=appointment.patient.user,
+    return Notification(
+        user_id=user_id,
         notification_type='appointment_confirmed',  # Reuse confirmed type with green icon
         title='Consultation Completed',
         message=message,
-        appointment=appointment,
+        related_appointment_id=appointment_id,
         action_url='/portal/appointments/'
     )
+
+
+def notify_appointment_completed(appointment):
+    """Notify patient that their appointment has been completed."""
+    slot = appointment.time_slot
+    _appointment_completed_notification(
+        appointment.id, appointment.patient.user_id, slot.date if slot else None
+    ).save()
+
+
+def notify_appointments_completed(rows):
+    """
+    Notify patients of a batch of completed appointments with one bulk insert.
+    
+    ``rows`` are ``(appointment_id, user_id, slot_date)`` tuples.
+    """
+    return Notification.objects.bulk_create(
+        [_appointment_completed_notification(*row) for row in rows],
+        batch_size=500,
+    )
@@ -2,17 +2,36 @@
 Booking notifications for Hills Clinic.
 
 Functions to send email notifications for appointment status changes.
+Each returns True if the email was sent; pass fail_silently=False to let
+errors propagate instead.
 """
 
 import logging
-from django.core.mail import send_mail
-from django.template.loader import render_to_string
+from functools import lru_cache
+from django.core.mail import get_connection, send_mail
+from django.template.loader import get_template
 from django.conf import settings
 
 logger = logging.getLogger(__name__)
 
+# Links in the emails. SITE_URL is read once at import, so a change to it
+# needs a process restart (as any settings change does).
+_SITE_URL = getattr(settings, 'SITE_URL', None)
+_BOOKING_URL = f"{_SITE_URL}/consultation/" if _SITE_URL else "#"
+_PAYMENT_URL_FMT = f"{_SITE_URL}/portal/appointments/{{}}/payment/" if _SITE_URL else "#"
 
-def send_appointment_confirmed(appointment):
+
+@lru_cache(maxsize=None)
+def _get_email_template(template_name):
+    """Resolve an email template once per process (resolved lazily, not at import)."""
+    return get_template(template_name)
+
+
+def _render(template_name, context):
+    return _get_email_template(template_name).render(context)
+
+
+def send_appointment_confirmed(appointment, fail_silently=True, connection=None):
     """Send email when appointment is confirmed (payment verified)."""
     try:
         patient = appointment.patient
@@ -20,7 +39,7 @@ def send_appointment_confirmed(appointment):
         
         logger.info(f"Sending appointment confirmation email to {patient.user.email}")
         
-        html_message = render_to_string('booking/emails/appointment_confirmed.html', {
+        html_message = _render('booking/emails/appointment_confirmed.html', {
             'patient': patient,
             'appointment': appointment,
         })
@@ -32,15 +51,18 @@ def send_appointment_confirmed(appointment):
             recipient_list=[patient.user.email],
             html_message=html_message,
             fail_silently=False,
+            connection=connection,
         )
         logger.info(f"Appointment confirmation email sent successfully to {patient.user.email}")
         return True
     except Exception as e:
         logger.error(f"Failed to send confirmation email to {patient.user.email}: {e}", exc_info=True)
+        if not fail_silently:
+            raise
         return False
 
 
-def send_payment_rejected(appointment, reason=None):
+def send_payment_rejected(appointment, reason=None, fail_silently=True, connection=None):
     """Send email when payment is rejected."""
     try:
         patient = appointment.patient
@@ -49,9 +71,9 @@ def send_payment_rejected(appointment, reason=None):
         logger.info(f"Sending payment rejected email to {patient.user.email}")
         
         # Build payment URL
-        payment_url = f"{settings.SITE_URL}/portal/appointments/{appointment.id}/payment/" if hasattr(settings, 'SITE_URL') else "#"
+        payment_url = _PAYMENT_URL_FMT.format(appointment.id) if _SITE_URL else "#"
         
-        html_message = render_to_string('booking/emails/payment_rejected.html', {
+        html_message = _render('booking/emails/payment_rejected.html', {
             'patient': patient,
             'appointment': appointment,
             'reason': reason,
@@ -65,15 +87,18 @@ def send_payment_rejected(appointment, reason=None):
             recipient_list=[patient.user.email],
             html_message=html_message,
             fail_silently=False,
+            connection=connection,
         )
         logger.info(f"Payment rejected email sent successfully to {patient.user.email}")
         return True
     except Exception as e:
         logger.error(f"Failed to send payment rejected email to {patient.user.email}: {e}", exc_info=True)
+        if not fail_silently:
+            raise
         return False
 
 
-def send_appointment_cancelled(appointment, reason='unpaid'):
+def send_appointment_cancelled(appointment, reason='unpaid', fail_silently=True, connection=None):
     """Send email when appointment is cancelled (usually due to non-payment)."""
     try:
         patient = appointment.patient
@@ -82,9 +107,9 @@ def send_appointment_cancelled(appointment, reason='unpaid'):
         logger.info(f"Sending appointment cancelled email to {patient.user.email}")
         
         # Build booking URL
-        booking_url = f"{settings.SITE_URL}/consultation/" if hasattr(settings, 'SITE_URL') else "#"
+        booking_url = _BOOKING_URL
         
-        html_message = render_to_string('booking/emails/appointment_cancelled.html', {
+        html_message = _render('booking/emails/appointment_cancelled.html', {
             'patient': patient,
             'appointment': appointment,
             'reason': reason,
@@ -98,9 +123,28 @@ def send_appointment_cancelled(appointment, reason='unpaid'):
             recipient_list=[patient.user.email],
             html_message=html_message,
             fail_silently=False,
+            connection=connection,
         )
         logger.info(f"Appointment cancelled email sent successfully to {patient.user.email}")
         return True
     except Exception as e:
         logger.error(f"Failed to send cancellation email to {patient.user.email}: {e}", exc_info=True)
+        if not fail_silently:
+            raise
         return False
+
+
+def send_appointment_batch(appointments, send=send_appointment_confirmed, **kwargs):
+    """
+    Send one notification per appointment over a single mail connection.
+    
+    ``send`` is any of the functions above; extra kwargs are passed through.
+    Returns the number of emails sent.
+    """
+    sent = 0
+    with get_connection() as connection:
+        for appointment in appointments:
+            # Failures are logged by send() and don't stop the batch
+            if send(appointment, connection=connection, **kwargs):
+                sent += 1
+    return sent
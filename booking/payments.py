@@ -7,6 +7,7 @@ Integrates with Stripe for:
 - Full payments
 """
 import stripe
+from functools import lru_cache
 from django.conf import settings
 from django.urls import reverse
 from decimal import Decimal
@@ -16,6 +17,12 @@ from decimal import Decimal
 stripe.api_key = getattr(settings, 'STRIPE_SECRET_KEY', '')
 
 
+@lru_cache(maxsize=128)
+def _format_amount(cents: int) -> str:
+    # Only a few fixed fees are ever rendered, so cache the formatted strings
+    return f"${cents / 100:.2f}"
+
+
 class PaymentService:
     """Service class for handling Stripe payments."""
     
@@ -25,6 +32,19 @@ class PaymentService:
     CONSULTATION_FEE = 15000  # $150
     DEPOSIT_AMOUNT = 100000   # $1,000
     
+    # Stripe product_data per payment type, built once. Shared across
+    # calls, so treat these dicts as read-only.
+    _PAYMENT_PRODUCT = {
+        payment_type: {'name': name, 'description': f'Hills Clinic - {name}'}
+        for payment_type, name in {
+            'video_consultation': 'Video Consultation Fee',
+            'consultation': 'Initial Consultation Deposit',
+            'deposit': 'Surgery Deposit',
+            'full': 'Full Payment',
+        }.items()
+    }
+    _DEFAULT_PRODUCT = {'name': 'Payment', 'description': 'Hills Clinic - Payment'}
+    
     @classmethod
     def create_checkout_session(
         cls,
@@ -54,22 +74,12 @@ class PaymentService:
         if not stripe.api_key:
             raise ValueError("Stripe API key not configured")
         
-        payment_descriptions = {
-            'video_consultation': 'Video Consultation Fee',
-            'consultation': 'Initial Consultation Deposit',
-            'deposit': 'Surgery Deposit',
-            'full': 'Full Payment',
-        }
-        
         session = stripe.checkout.Session.create(
             payment_method_types=['card'],
             line_items=[{
                 'price_data': {
                     'currency': cls.CURRENCY,
-                    'product_data': {
-                        'name': payment_descriptions.get(payment_type, 'Payment'),
-                        'description': f'Hills Clinic - {payment_descriptions.get(payment_type, "Payment")}',
-                    },
+                    'product_data': cls._PAYMENT_PRODUCT.get(payment_type, cls._DEFAULT_PRODUCT),
                     'unit_amount': amount,
                 },
                 'quantity': 1,
@@ -155,4 +165,4 @@ class PaymentService:
     @classmethod
     def format_amount(cls, cents: int) -> str:
         """Format cents as dollar string."""
-        return f"${cents / 100:.2f}"
+        return _format_amount(cents)
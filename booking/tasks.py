@@ -0,0 +1,26 @@
+"""
+Background tasks for booking app.
+"""
+
+from celery import shared_task
+
+from .models import Appointment
+from .notifications import send_appointment_batch
+
+
+@shared_task
+def send_appointment_confirmations(appointment_ids):
+    """Send confirmation emails for a batch of appointments outside the admin request."""
+    # The confirmation never reads the free-text notes; leave them in the DB
+    appointments = Appointment.objects.filter(
+        id__in=appointment_ids
+    ).select_related('patient__user', 'time_slot').defer('patient_notes', 'doctor_notes')
+    
+    # One mail connection for the whole batch; returns how many were sent
+    return send_appointment_batch(appointments, send=Appointment.send_confirmation_email)
+
+
+@shared_task
+def update_appointment_statuses():
+    """Periodic sweep: cancel unpaid appointments past their deadline and complete past ones."""
+    return Appointment.auto_update_statuses()
@@ -1,3 +1,219 @@
-from django.test import TestCase
+from datetime import time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from portal.models import Notification
+
+from .models import AUTO_CANCEL_NOTE, Appointment, Patient, Payment, TimeSlot, VideoConsultation
+
+User = get_user_model()
+
+# Sessions and Notification.staff_ids() use the cache; don't need Redis in tests
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+def make_patient(email='patient@example.com'):
+    user = User.objects.create_user(username=email, email=email, password='secret')
+    return Patient.objects.create(user=user)
+
+
+def make_slot(days, start=time(10, 0), end=time(11, 0)):
+    return TimeSlot.objects.create(
+        date=(timezone.now() + timedelta(days=days)).date(),
+        start_time=start,
+        end_time=end,
+        timezone='UTC',
+    )
+
+
+def make_consultation(**kwargs):
+    fields = {
+        'patient_name': 'Test Patient',
+        'patient_email': 'consult@example.com',
+        'scheduled_date': (timezone.now() + timedelta(days=3)).date(),
+        'scheduled_time': time(9, 0),
+        'reason': 'Height consultation',
+        **kwargs,
+    }
+    return VideoConsultation.objects.create(**fields)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class AutoUpdateStatusesTests(TestCase):
+    def setUp(self):
+        self.patient = make_patient()
+
+    def test_completes_past_confirmed_appointments_and_notifies(self):
+        past = Appointment.objects.create(
+            patient=self.patient, time_slot=make_slot(-2), status='confirmed', payment_status='verified'
+        )
+
+        result = Appointment.auto_update_statuses()
+
+        past.refresh_from_db()
+        self.assertEqual(past.status, 'completed')
+        self.assertEqual(result, {'unpaid_cancelled': 0, 'past_completed': 1})
+        self.assertTrue(
+            Notification.objects.filter(user=self.patient.user, related_appointment=past).exists()
+        )
+
+    def test_leaves_future_and_unconfirmed_appointments(self):
+        future = Appointment.objects.create(
+            patient=self.patient, time_slot=make_slot(2), status='confirmed', payment_status='verified'
+        )
+        pending = Appointment.objects.create(
+            patient=self.patient, time_slot=make_slot(-2, time(12, 0), time(13, 0)),
+            status='pending', payment_status='verified',
+        )
+
+        Appointment.auto_update_statuses()
+
+        future.refresh_from_db()
+        pending.refresh_from_db()
+        self.assertEqual(future.status, 'confirmed')
+        self.assertEqual(pending.status, 'pending')
+        self.assertFalse(Notification.objects.exists())
+
+    def test_cancels_overdue_unpaid_appointments_with_note(self):
+        overdue = Appointment.objects.create(
+            patient=self.patient,
+            status='pending',
+            payment_status='pending',
+            payment_deadline=timezone.now() - timedelta(hours=1),
+            doctor_notes='Existing note',
+        )
+        in_time = Appointment.objects.create(
+            patient=self.patient,
+            status='pending',
+            payment_status='pending',
+            payment_deadline=timezone.now() + timedelta(hours=1),
+        )
+
+        result = Appointment.auto_update_statuses()
+
+        overdue.refresh_from_db()
+        in_time.refresh_from_db()
+        self.assertEqual(result['unpaid_cancelled'], 1)
+        self.assertEqual(overdue.status, 'cancelled')
+        self.assertEqual(overdue.doctor_notes, 'Existing note' + AUTO_CANCEL_NOTE)
+        self.assertEqual(in_time.status, 'pending')
+
+    def test_complete_past_returns_notification_rows(self):
+        slot = make_slot(-2)
+        past = Appointment.objects.create(patient=self.patient, time_slot=slot, status='confirmed')
+
+        rows = Appointment._complete_past(timezone.now() - timedelta(hours=1))
+
+        self.assertEqual([tuple(row) for row in rows], [(past.id, self.patient.user_id, slot.date)])
+        # A second sweep finds nothing left to complete
+        self.assertEqual(list(Appointment._complete_past(timezone.now())), [])
+
+    def test_complete_past_sees_slots_written_without_save(self):
+        slot = TimeSlot.objects.bulk_create([
+            TimeSlot(
+                date=(timezone.now() + timedelta(days=2)).date(),
+                start_time=time(10, 0),
+                end_time=time(11, 0),
+                timezone='UTC',
+            )
+        ])[0]
+        appointment = Appointment.objects.create(patient=self.patient, time_slot=slot, status='confirmed')
+        self.assertFalse(appointment.is_past_appointment())
+
+        # Moving the slot into the past through update() re-derives end_datetime
+        TimeSlot.objects.filter(pk=slot.pk).update(date=(timezone.now() - timedelta(days=2)).date())
+
+        rows = Appointment._complete_past(timezone.now() - timedelta(hours=1))
+        self.assertEqual([row[0] for row in rows], [appointment.id])
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class BookingAdminActionTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser('admin', 'admin@example.com', 'secret')
+        self.client.force_login(self.admin)
+
+    def run_action(self, model_name, action, objects):
+        return self.client.post(reverse(f'admin:booking_{model_name}_changelist'), {
+            'action': action,
+            '_selected_action': [str(obj.pk) for obj in objects],
+        })
+
+    def test_mark_scheduled_assigns_meeting_rooms(self):
+        pending = [make_consultation(), make_consultation(patient_email='other@example.com')]
+        completed = make_consultation(status='completed')
+
+        response = self.run_action('videoconsultation', 'mark_scheduled', [*pending, completed])
+
+        self.assertEqual(response.status_code, 302)
+        for consultation in pending:
+            consultation.refresh_from_db()
+            self.assertEqual(consultation.status, 'scheduled')
+            self.assertTrue(consultation.room_id.startswith('HillsClinic-'))
+            self.assertTrue(consultation.meeting_url.endswith(consultation.room_id))
+        completed.refresh_from_db()
+        self.assertEqual(completed.status, 'completed')
+        self.assertEqual(completed.room_id, '')
+
+    def test_generate_meeting_rooms_keeps_existing_rooms(self):
+        existing = make_consultation(room_id='HillsClinic-existing', meeting_url='https://meet.jit.si/HillsClinic-existing')
+        missing = make_consultation()
+
+        self.run_action('videoconsultation', 'generate_meeting_rooms', [existing, missing])
+
+        existing.refresh_from_db()
+        missing.refresh_from_db()
+        self.assertEqual(existing.room_id, 'HillsClinic-existing')
+        self.assertTrue(missing.room_id.startswith('HillsClinic-'))
+
+    def test_payment_mark_completed_unlocks_consultation(self):
+        consultation = make_consultation()
+        payment = Payment.objects.create(
+            email='consult@example.com',
+            payment_type='video_consultation',
+            amount=150,
+            video_consultation=consultation,
+        )
+        refunded = Payment.objects.create(
+            email='consult@example.com', payment_type='video_consultation', amount=150, status='refunded'
+        )
+
+        self.run_action('payment', 'mark_completed', [payment, refunded])
+
+        payment.refresh_from_db()
+        refunded.refresh_from_db()
+        consultation.refresh_from_db()
+        self.assertEqual(payment.status, 'completed')
+        self.assertIsNotNone(payment.paid_at)
+        self.assertEqual(refunded.status, 'refunded')
+        self.assertEqual(consultation.status, 'scheduled')
+        self.assertTrue(consultation.room_id)
+
+    def test_mark_confirmed_updates_selected_appointments(self):
+        patient = make_patient()
+        selected = Appointment.objects.create(patient=patient)
+        other = Appointment.objects.create(patient=patient)
+
+        self.run_action('appointment', 'mark_confirmed', [selected])
+
+        selected.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(selected.status, 'confirmed')
+        self.assertEqual(other.status, 'pending')
+
+    def test_send_confirmation_sends_one_email_per_appointment(self):
+        appointments = [
+            Appointment.objects.create(patient=make_patient('one@example.com'), time_slot=make_slot(2)),
+            Appointment.objects.create(patient=make_patient('two@example.com')),
+        ]
+
+        self.run_action('appointment', 'send_confirmation', appointments)
+
+        self.assertEqual(
+            sorted(message.to[0] for message in mail.outbox), ['one@example.com', 'two@example.com']
+        )
 
-# Create your tests here.
@@ -7,6 +7,10 @@ from . import views
 app_name = "booking"
 
 urlpatterns = [
+    # API endpoints first: they are polled, and patterns resolve in order
+    path('api/appointment/<uuid:appointment_id>/status/', views.AppointmentStatusView.as_view(), name='appointment_status'),
+    path('api/slots/', views.AvailableTimeSlotsView.as_view(), name='available_slots'),
+    
     # Booking pages
     path('consultation/', views.ConsultationBookingView.as_view(), name='consultation'),
     path('success/', views.BookingSuccessView.as_view(), name='booking_success'),
@@ -30,10 +34,6 @@ urlpatterns = [
     # HTMX endpoints
     path('callback/', views.QuickCallbackView.as_view(), name='quick_callback'),
     
-    # API endpoints
-    path('api/slots/', views.AvailableTimeSlotsView.as_view(), name='available_slots'),
-    path('api/appointment/<uuid:appointment_id>/status/', views.AppointmentStatusView.as_view(), name='appointment_status'),
-    
     # Calendar file
     path('calendar/<uuid:appointment_id>.ics', views.GenerateICSView.as_view(), name='generate_ics'),
     path('appointment/<int:pk>/ics/', views.AppointmentICSView.as_view(), name='ics'),
@@ -13,6 +13,38 @@ from django.conf import settings
 from django.utils import timezone
 
 
+# Static part of the Jitsi embed config, built once. get_meeting_config()
+# returns a shallow copy, so the nested dicts are shared: don't mutate them.
+_BASE_MEETING_CONFIG = {
+    'width': '100%',
+    'height': 600,
+    'parentNode': 'meet',
+    'configOverwrite': {
+        'startWithAudioMuted': True,
+        'startWithVideoMuted': False,
+        'enableClosePage': True,
+        'disableDeepLinking': True,
+        'prejoinPageEnabled': False,
+        'enableWelcomePage': False,
+    },
+    'interfaceConfigOverwrite': {
+        'TOOLBAR_BUTTONS': [
+            'microphone', 'camera', 'desktop', 'fullscreen',
+            'fodeviceselection', 'hangup', 'chat', 'settings',
+            'videoquality', 'filmstrip', 'tileview',
+        ],
+        'SHOW_JITSI_WATERMARK': False,
+        'SHOW_WATERMARK_FOR_GUESTS': False,
+        'DEFAULT_BACKGROUND': '#1a1a2e',
+        'TOOLBAR_ALWAYS_VISIBLE': True,
+    },
+}
+
+# Join window: open 10 minutes early, close 15 minutes after the scheduled end
+_START_BUFFER = timedelta(minutes=10)
+_END_BUFFER_60 = timedelta(minutes=60 + 15)
+
+
 class VideoConferenceService:
     """Service class for managing video consultations."""
     
@@ -31,10 +63,11 @@ class VideoConferenceService:
         Returns:
             Unique room identifier
         """
-        # Create a hash-based room ID for privacy
+        # Create a hash-based room ID for privacy. The hash is only a short
+        # opaque id (uuid4 supplies the entropy), so use BLAKE2s with a
+        # 6-byte digest: 12 hex chars without hashing to 32 and slicing.
         unique_string = f"{consultation_id}-{patient_email}-{uuid.uuid4()}"
-        hash_object = hashlib.sha256(unique_string.encode())
-        room_hash = hash_object.hexdigest()[:12]
+        room_hash = hashlib.blake2s(unique_string.encode(), digest_size=6).hexdigest()
         
         return f"HillsClinic-{room_hash}"
     
@@ -64,34 +97,10 @@ class VideoConferenceService:
         Returns:
             Configuration dictionary for Jitsi API
         """
-        return {
-            'roomName': room_id,
-            'width': '100%',
-            'height': 600,
-            'parentNode': 'meet',
-            'configOverwrite': {
-                'startWithAudioMuted': True,
-                'startWithVideoMuted': False,
-                'enableClosePage': True,
-                'disableDeepLinking': True,
-                'prejoinPageEnabled': False,
-                'enableWelcomePage': False,
-            },
-            'interfaceConfigOverwrite': {
-                'TOOLBAR_BUTTONS': [
-                    'microphone', 'camera', 'desktop', 'fullscreen',
-                    'fodeviceselection', 'hangup', 'chat', 'settings',
-                    'videoquality', 'filmstrip', 'tileview',
-                ],
-                'SHOW_JITSI_WATERMARK': False,
-                'SHOW_WATERMARK_FOR_GUESTS': False,
-                'DEFAULT_BACKGROUND': '#1a1a2e',
-                'TOOLBAR_ALWAYS_VISIBLE': True,
-            },
-            'userInfo': {
-                'displayName': display_name,
-            }
-        }
+        config = dict(_BASE_MEETING_CONFIG)
+        config['roomName'] = room_id
+        config['userInfo'] = {'displayName': display_name}
+        return config
     
     @classmethod
     def create_consultation_room(cls, consultation) -> tuple:
@@ -106,7 +115,7 @@ class VideoConferenceService:
         """
         room_id = cls.generate_room_id(
             consultation.id,
-            consultation.patient.email
+            consultation.patient_email
         )
         meeting_url = cls.get_meeting_url(room_id)
         
@@ -124,17 +133,13 @@ class VideoConferenceService:
         Returns:
             True if meeting should be accessible
         """
-        now = timezone.now()
-        
-        # Allow joining 10 minutes early
-        start_buffer = timedelta(minutes=10)
         # Allow staying until duration + 15 minutes after
-        end_buffer = timedelta(minutes=duration_minutes + 15)
-        
-        meeting_start = scheduled_time - start_buffer
-        meeting_end = scheduled_time + end_buffer
+        if duration_minutes == 60:
+            end_buffer = _END_BUFFER_60
+        else:
+            end_buffer = timedelta(minutes=duration_minutes + 15)
         
-        return meeting_start <= now <= meeting_end
+        return scheduled_time - _START_BUFFER <= timezone.now() <= scheduled_time + end_buffer
     
     @classmethod
     def get_join_instructions(cls) -> dict:
@@ -298,7 +298,7 @@ class GenerateICSView(View):
     """Generate ICS calendar file for appointment."""
     
     def get(self, request, appointment_id):
-        appointment = get_object_or_404(Appointment, id=appointment_id)
+        appointment = get_object_or_404(Appointment.objects.select_related('time_slot'), id=appointment_id)
         
         if not appointment.time_slot:
             return HttpResponse('No time slot assigned', status=400)
@@ -384,7 +384,7 @@ class AppointmentICSView(View):
     """Generate ICS file for an appointment using integer PK."""
     
     def get(self, request, pk):
-        appointment = get_object_or_404(Appointment, pk=pk)
+        appointment = get_object_or_404(Appointment.objects.select_related('time_slot'), pk=pk)
         
         # Verify the appointment belongs to the current user
         if request.user.is_authenticated:
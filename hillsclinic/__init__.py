@@ -1,3 +1,9 @@
+# Load the Celery app whenever Django starts so @shared_task uses it
+from .celery import app as celery_app
+
+__all__ = ("celery_app",)
+
+
 # Monkey-patch modelsearch to avoid Python 3.12 typing bug
 def _patch_modelsearch():
     try:
@@ -10,4 +16,4 @@ def _patch_modelsearch():
     except Exception:
         pass
 
-_patch_modelsearch()
\ No newline at end of file
+_patch_modelsearch()
@@ -0,0 +1,16 @@
+"""
+Celery application for Hills Clinic background tasks.
+
+Tasks live in each app's tasks.py and are discovered automatically.
+"""
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "hillsclinic.settings")
+
+app = Celery("hillsclinic")
+app.config_from_object("django.conf:settings", namespace="CELERY")
+app.autodiscover_tasks()
+
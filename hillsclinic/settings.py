@@ -93,7 +93,7 @@ MIDDLEWARE = [
     "django_htmx.middleware.HtmxMiddleware",
     "allauth.account.middleware.AccountMiddleware",
     "wagtail.contrib.redirects.middleware.RedirectMiddleware",
-    "booking.middleware.AppointmentStatusMiddleware",  # Auto-complete past appointments
+    "booking.middleware.AppointmentStatusMiddleware",  # Status sweep unless APPOINTMENT_SWEEP_IN_MIDDLEWARE is off
 ]
 
 ROOT_URLCONF = "hillsclinic.urls"
@@ -162,8 +162,10 @@ CACHES = {
     }
 }
 
-# Session backend (use cache in production)
+# Session backend: reads are served from the cache (Redis when REDIS_URL is set),
+# with the database only as a write-through fallback
 SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
+SESSION_SERIALIZER = "django.contrib.sessions.serializers.JSONSerializer"
 
 # =============================================================================
 # AUTHENTICATION
@@ -444,6 +446,23 @@ CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = TIME_ZONE
+# Without a dedicated broker (e.g. single-service deploys), run tasks inline
+CELERY_TASK_ALWAYS_EAGER = not os.getenv("CELERY_BROKER_URL")
+# Outgoing email gets its own queue: celery -A hillsclinic worker -Q celery,email_queue
+CELERY_TASK_ROUTES = {
+    "accounts.tasks.send_email_task": {"queue": "email_queue"},
+}
+# Periodic jobs, run by: celery -A hillsclinic beat
+CELERY_BEAT_SCHEDULE = {
+    "update-appointment-statuses": {
+        "task": "booking.tasks.update_appointment_statuses",
+        "schedule": 300.0,  # every 5 minutes
+    },
+}
+# booking.middleware.AppointmentStatusMiddleware runs the same sweep from
+# requests. Turn it off only where beat is running, or nothing will update
+# appointment statuses.
+APPOINTMENT_SWEEP_IN_MIDDLEWARE = os.getenv("APPOINTMENT_SWEEP_IN_MIDDLEWARE", "True").lower() in ("true", "1", "yes")
 
 # Default primary key field type
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
@@ -9,6 +9,7 @@ Models for patient portal functionality:
 
 from django.db import models
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.core.validators import FileExtensionValidator
 from django.utils import timezone
 import os
@@ -17,6 +18,9 @@ from portal.storage import PatientUploadStorage
 
 User = get_user_model()
 
+STAFF_IDS_CACHE_KEY = 'notification_staff_ids'
+STAFF_IDS_CACHE_TIMEOUT = 60  # seconds
+
 
 def upload_to_patient_folder(instance, filename):
     """Upload patient files to their specific folder."""
@@ -534,9 +538,9 @@ class Notification(models.Model):
     
     @classmethod
     def create_for_user(cls, user, notification_type, title, message, appointment=None, action_url=''):
-        """Create a notification for a user."""
+        """Create a notification for a user; ``user`` may be a User or just its id."""
         return cls.objects.create(
-            user=user,
+            user_id=getattr(user, 'pk', user),
             notification_type=notification_type,
             title=title,
             message=message,
@@ -544,21 +548,31 @@ class Notification(models.Model):
             action_url=action_url
         )
     
+    @staticmethod
+    def staff_ids():
+        """Ids of staff users, cached briefly so bursts of events share one lookup."""
+        ids = cache.get(STAFF_IDS_CACHE_KEY)
+        if ids is None:
+            ids = list(User.objects.filter(is_staff=True).values_list('id', flat=True))
+            cache.set(STAFF_IDS_CACHE_KEY, ids, STAFF_IDS_CACHE_TIMEOUT)
+        return ids
+    
     @classmethod
     def create_for_staff(cls, notification_type, title, message, appointment=None, action_url=''):
         """Create notifications for all staff members."""
-        staff_users = User.objects.filter(is_staff=True)
-        notifications = []
-        for user in staff_users:
-            notifications.append(cls(
-                user=user,
+        staff_ids = cls.staff_ids()
+        notifications = [
+            cls(
+                user_id=user_id,
                 notification_type=notification_type,
                 title=title,
                 message=message,
                 related_appointment=appointment,
                 action_url=action_url
-            ))
-        return cls.objects.bulk_create(notifications)
+            )
+            for user_id in staff_ids
+        ]
+        return cls.objects.bulk_create(notifications, batch_size=500)
     
     @classmethod
     def unread_count(cls, user):
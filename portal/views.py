@@ -748,7 +748,7 @@ class AppointmentPaymentView(PatientRequiredMixin, TemplateView):
         from .forms import PaymentProofForm
         
         appointment = get_object_or_404(
-            Appointment,
+            Appointment.objects.select_related('patient__user'),
             pk=self.kwargs['pk'],
             patient=request.user.patient_profile
         )
@@ -18,7 +18,7 @@ from datetime import timedelta
 
 from .decorators import staff_required, doctor_required, is_staff_user, is_doctor_only
 from booking.models import Patient, Appointment, TimeSlot, VideoConsultation, Payment
-from booking.notifications import send_appointment_confirmed, send_payment_rejected, send_appointment_cancelled
+from booking.notifications import send_appointment_confirmed, send_payment_rejected
 from portal.models import PortalUpload, ConsentRecord
 
 
@@ -350,10 +350,13 @@ def appointment_detail(request, appointment_id):
                         slot.save()
                         appointment.save()
                         # Send confirmation email and notification
-                        send_appointment_confirmed(appointment)
+                        email_sent = send_appointment_confirmed(appointment)
                         from booking.notification_helpers import notify_appointment_confirmed
                         notify_appointment_confirmed(appointment)
-                        messages.success(request, f"Appointment confirmed for {slot.date} at {slot.start_time}. Confirmation email sent to patient.")
+                        if email_sent:
+                            messages.success(request, f"Appointment confirmed for {slot.date} at {slot.start_time}. Confirmation email sent to patient.")
+                        else:
+                            messages.warning(request, f"Appointment confirmed for {slot.date} at {slot.start_time}, but the confirmation email could not be sent.")
                     except TimeSlot.DoesNotExist:
                         messages.error(request, "Selected time slot is not available.")
                 else:
@@ -417,10 +420,13 @@ def appointment_detail(request, appointment_id):
                 appointment.payment_notes = payment_notes
                 appointment.save()
                 # Send rejection email and notification
-                send_payment_rejected(appointment, reason=payment_notes)
+                email_sent = send_payment_rejected(appointment, reason=payment_notes)
                 from booking.notification_helpers import notify_payment_rejected
                 notify_payment_rejected(appointment, reason=payment_notes)
-                messages.warning(request, "Payment rejected. Patient has been notified to retry.")
+                if email_sent:
+                    messages.warning(request, "Payment rejected. Patient has been notified to retry.")
+                else:
+                    messages.warning(request, "Payment rejected. The patient was notified in the portal, but the email could not be sent.")
             else:
                 messages.error(request, "Unknown action.")
         else: